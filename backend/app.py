@@ -1,4 +1,4 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, g
 from flask_cors import CORS
 import os
 import traceback
@@ -8,6 +8,7 @@ from services.nlp_service import NLPService
 from services.deepfake_service import DeepfakeDetectionService
 from services.classification_service import CallClassificationService
 from services.firebase_service import FirebaseService
+from services.admission_service import AdmissionController, ServiceOverloaded
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -17,17 +18,27 @@ CORS(app)
 # Ensure upload folder exists
 os.makedirs(Config.TEMP_UPLOAD_FOLDER, exist_ok=True)
 
-# Initialize services
-try:
-    speech_service = SpeechToTextService()
-    nlp_service = NLPService()
-    deepfake_service = DeepfakeDetectionService()
-    classification_service = CallClassificationService()
-    firebase_service = FirebaseService()
-    print("✅ All services initialized successfully")
-except Exception as e:
-    print(f"❌ Error initializing services: {e}")
-    traceback.print_exc()
+# Bound concurrency of the expensive endpoints so they can't starve the cheap ones
+admission = AdmissionController(
+    Config.ENDPOINT_CONCURRENCY,
+    max_queue=Config.ADMISSION_QUEUE_SIZE,
+    queue_timeout=Config.ADMISSION_QUEUE_TIMEOUT,
+    retry_after=Config.ADMISSION_RETRY_AFTER
+)
+
+# Initialize services; feature extraction workers re-import this module
+# as __mp_main__ when started with `python app.py` and need none of them
+if __name__ != '__mp_main__':
+    try:
+        speech_service = SpeechToTextService()
+        nlp_service = NLPService()
+        deepfake_service = DeepfakeDetectionService()
+        classification_service = CallClassificationService()
+        firebase_service = FirebaseService()
+        print("✅ All services initialized successfully")
+    except Exception as e:
+        print(f"❌ Error initializing services: {e}")
+        traceback.print_exc()
 
 @app.route('/', methods=['GET'])
 def home():
@@ -39,6 +50,7 @@ def home():
     })
 
 @app.route('/api/speech-to-text', methods=['POST'])
+@admission.limit('speech_to_text')
 def speech_to_text():
     """Convert audio to text using Google Speech-to-Text"""
     try:
@@ -51,12 +63,12 @@ def speech_to_text():
             return jsonify({'error': 'Empty filename'}), 400
         
         # Transcribe audio
-        transcript = speech_service.transcribe_audio(audio_file)
+        transcript, language = speech_service.transcribe_with_language(audio_file)
         
         return jsonify({
             'transcript': transcript,
             'status': 'success',
-            'language_detected': 'en-IN'
+            'language_detected': language
         })
     except Exception as e:
         print(f"Speech-to-text error: {e}")
@@ -64,17 +76,19 @@ def speech_to_text():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/detect-intent', methods=['POST'])
+@admission.limit('detect_intent')
 def detect_intent():
     """Detect call intent using NLP"""
     try:
         data = request.json
         text = data.get('text', '')
+        language = data.get('language')
         
         if not text:
             return jsonify({'error': 'No text provided'}), 400
         
         # Analyze intent
-        intent_result = nlp_service.analyze_intent(text)
+        intent_result = nlp_service.analyze_intent(text, language=language)
         
         return jsonify(intent_result)
     except Exception as e:
@@ -83,6 +97,7 @@ def detect_intent():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/detect-deepfake', methods=['POST'])
+@admission.limit('detect_deepfake')
 def detect_deepfake():
     """Detect if voice is AI-generated (deepfake)"""
     try:
@@ -93,6 +108,7 @@ def detect_deepfake():
         
         # Analyze for deepfake
         deepfake_result = deepfake_service.analyze_audio(audio_file)
+        deepfake_result.setdefault('timings', {})['queue_wait_ms'] = g.queue_wait_ms
         
         return jsonify(deepfake_result)
     except Exception as e:
@@ -101,6 +117,7 @@ def detect_deepfake():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/classify-call', methods=['POST'])
+@admission.limit('classify_call')
 def classify_call():
     """Final call classification combining all analyses"""
     try:
@@ -116,6 +133,12 @@ def classify_call():
             deepfake=data.get('deepfake', {})
         )
         
+        # Keep the clip fingerprint so confirmed spam can be indexed later;
+        # the client only holds the clip ID the deepfake check issued
+        result['fingerprint'] = deepfake_service.claim_fingerprints(
+            data.get('deepfake', {}).get('clip_id')
+        )
+        
         # Save to Firebase
         result_id = firebase_service.save_call_analysis(result)
         result['id'] = result_id
@@ -156,6 +179,11 @@ def submit_feedback():
         # Save feedback
         firebase_service.save_feedback(result_id, is_correct)
         
+        # Confirmed spam recordings get instant verdicts next time
+        if is_correct:
+            analysis = firebase_service.get_call_analysis(result_id)
+            deepfake_service.remember_confirmed_scam(result_id, analysis)
+        
         return jsonify({
             'status': 'success',
             'message': 'Feedback saved successfully'
@@ -175,6 +203,16 @@ def get_stats():
         print(f"Stats error: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.errorhandler(ServiceOverloaded)
+def overloaded(e):
+    response = jsonify({
+        'error': e.reason,
+        'endpoint': e.endpoint,
+        'retry_after': e.retry_after
+    })
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response, e.status_code
+
 @app.errorhandler(404)
 def not_found(e):
     return jsonify({'error': 'Endpoint not found'}), 404
@@ -0,0 +1,259 @@
+"""
+Async (ASGI) variant of the PhantomX API
+
+Serves the same routes and response shapes as app.py, but Google Speech
+and Language calls go through their async clients, and blocking Firestore
+and deepfake work is offloaded, so one worker can hold hundreds of
+external calls in flight. Run with:
+
+    hypercorn asgi_app:app --bind 0.0.0.0:5000
+"""
+import asyncio
+import functools
+import os
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from quart import Quart, request, jsonify, g
+from quart_cors import cors
+from config import Config
+from services.speech_service import SpeechToTextService
+from services.nlp_service import NLPService
+from services.deepfake_service import DeepfakeDetectionService
+from services.classification_service import CallClassificationService
+from services.firebase_service import FirebaseService
+from services.admission_service import AdmissionController, ServiceOverloaded
+
+# Initialize Quart app
+app = Quart(__name__)
+app.config.from_object(Config)
+app = cors(app)
+
+# Ensure upload folder exists
+os.makedirs(Config.TEMP_UPLOAD_FOLDER, exist_ok=True)
+
+# Only CPU-bound endpoints need tight limits here
+admission = AdmissionController(
+    Config.ASYNC_ENDPOINT_CONCURRENCY,
+    max_queue=Config.ADMISSION_QUEUE_SIZE,
+    queue_timeout=Config.ADMISSION_QUEUE_TIMEOUT,
+    retry_after=Config.ADMISSION_RETRY_AFTER
+)
+
+# Threads for client libraries without an async API (Firestore, file I/O)
+offload_executor = ThreadPoolExecutor(
+    max_workers=Config.ASYNC_OFFLOAD_THREADS,
+    thread_name_prefix='phantomx-offload'
+)
+
+# Initialize services; feature extraction workers re-import this module
+# as __mp_main__ when started with `python asgi_app.py` and need none of them
+if __name__ != '__mp_main__':
+    try:
+        speech_service = SpeechToTextService()
+        nlp_service = NLPService()
+        deepfake_service = DeepfakeDetectionService()
+        classification_service = CallClassificationService()
+        firebase_service = FirebaseService()
+        print("✅ All services initialized successfully")
+    except Exception as e:
+        print(f"❌ Error initializing services: {e}")
+        traceback.print_exc()
+
+
+async def offload(func, *args, **kwargs):
+    """Run a blocking call on the offload thread pool"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        offload_executor, functools.partial(func, *args, **kwargs)
+    )
+
+@app.route('/', methods=['GET'])
+async def home():
+    """Health check endpoint"""
+    return jsonify({
+        'status': 'online',
+        'service': 'PhantomX API',
+        'version': '1.0.0'
+    })
+
+@app.route('/api/speech-to-text', methods=['POST'])
+@admission.limit_async('speech_to_text')
+async def speech_to_text():
+    """Convert audio to text using Google Speech-to-Text"""
+    try:
+        files = await request.files
+        if 'audio' not in files:
+            return jsonify({'error': 'No audio file provided'}), 400
+
+        audio_file = files['audio']
+
+        if audio_file.filename == '':
+            return jsonify({'error': 'Empty filename'}), 400
+
+        # Transcribe audio
+        transcript, language = await speech_service.transcribe_with_language_async(audio_file)
+
+        return jsonify({
+            'transcript': transcript,
+            'status': 'success',
+            'language_detected': language
+        })
+    except Exception as e:
+        print(f"Speech-to-text error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/detect-intent', methods=['POST'])
+@admission.limit_async('detect_intent')
+async def detect_intent():
+    """Detect call intent using NLP"""
+    try:
+        data = await request.get_json()
+        text = data.get('text', '')
+        language = data.get('language')
+
+        if not text:
+            return jsonify({'error': 'No text provided'}), 400
+
+        # Analyze intent
+        intent_result = await nlp_service.analyze_intent_async(text, language=language)
+
+        return jsonify(intent_result)
+    except Exception as e:
+        print(f"Intent detection error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/detect-deepfake', methods=['POST'])
+@admission.limit_async('detect_deepfake')
+async def detect_deepfake():
+    """Detect if voice is AI-generated (deepfake)"""
+    try:
+        files = await request.files
+        if 'audio' not in files:
+            return jsonify({'error': 'No audio file provided'}), 400
+
+        audio_file = files['audio']
+
+        # Analyze for deepfake; feature extraction runs in the process pool
+        deepfake_result = await offload(deepfake_service.analyze_audio, audio_file)
+        deepfake_result.setdefault('timings', {})['queue_wait_ms'] = g.queue_wait_ms
+
+        return jsonify(deepfake_result)
+    except Exception as e:
+        print(f"Deepfake detection error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/classify-call', methods=['POST'])
+@admission.limit_async('classify_call')
+async def classify_call():
+    """Final call classification combining all analyses"""
+    try:
+        data = await request.get_json()
+
+        if not data:
+            return jsonify({'error': 'No data provided'}), 400
+
+        # Classify call
+        result = classification_service.classify(
+            transcript=data.get('transcript', ''),
+            intent=data.get('intent', {}),
+            deepfake=data.get('deepfake', {})
+        )
+
+        # Keep the clip fingerprint so confirmed spam can be indexed later;
+        # the client only holds the clip ID the deepfake check issued
+        result['fingerprint'] = await offload(
+            deepfake_service.claim_fingerprints, data.get('deepfake', {}).get('clip_id')
+        )
+
+        # Save to Firebase
+        result_id = await offload(firebase_service.save_call_analysis, result)
+        result['id'] = result_id
+
+        return jsonify(result)
+    except Exception as e:
+        print(f"Classification error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/history', methods=['GET'])
+async def get_history():
+    """Get call analysis history"""
+    try:
+        limit = request.args.get('limit', 50, type=int)
+        history = await offload(firebase_service.get_call_history, limit=limit)
+
+        return jsonify({
+            'history': history,
+            'count': len(history)
+        })
+    except Exception as e:
+        print(f"History retrieval error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/feedback', methods=['POST'])
+async def submit_feedback():
+    """Submit user feedback for continuous learning"""
+    try:
+        data = await request.get_json()
+        result_id = data.get('result_id')
+        is_correct = data.get('is_correct')
+
+        if result_id is None or is_correct is None:
+            return jsonify({'error': 'Missing required fields'}), 400
+
+        # Save feedback
+        await offload(firebase_service.save_feedback, result_id, is_correct)
+
+        # Confirmed spam recordings get instant verdicts next time
+        if is_correct:
+            analysis = await offload(firebase_service.get_call_analysis, result_id)
+            await offload(deepfake_service.remember_confirmed_scam, result_id, analysis)
+
+        return jsonify({
+            'status': 'success',
+            'message': 'Feedback saved successfully'
+        })
+    except Exception as e:
+        print(f"Feedback error: {e}")
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/stats', methods=['GET'])
+async def get_stats():
+    """Get overall statistics"""
+    try:
+        stats = await offload(firebase_service.get_statistics)
+        return jsonify(stats)
+    except Exception as e:
+        print(f"Stats error: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.errorhandler(ServiceOverloaded)
+async def overloaded(e):
+    response = jsonify({
+        'error': e.reason,
+        'endpoint': e.endpoint,
+        'retry_after': e.retry_after
+    })
+    response.headers['Retry-After'] = str(e.retry_after)
+    return response, e.status_code
+
+@app.errorhandler(404)
+async def not_found(e):
+    return jsonify({'error': 'Endpoint not found'}), 404
+
+@app.errorhandler(500)
+async def server_error(e):
+    return jsonify({'error': 'Internal server error'}), 500
+
+if __name__ == '__main__':
+    print(f"🚀 Starting PhantomX async API on {Config.HOST}:{Config.PORT}")
+    app.run(
+        debug=Config.DEBUG,
+        host=Config.HOST,
+        port=Config.PORT
+    )
@@ -0,0 +1,223 @@
+"""
+Sync (Flask) vs async (Quart) throughput with latency-injecting backends
+
+The real services run on both apps, but the Google Speech and Language
+clients they create are replaced by fakes that sleep for --latency
+seconds (blocking in the sync clients, awaiting in the async ones), so
+`analyze_intent_async` and `transcribe_with_language_async` are measured
+as shipped. Firestore, which the async app offloads to threads, is faked
+the same way. The sync app is limited to --sync-threads concurrent
+requests, like a gthread worker; the async app's offload pool gets
+--offload-threads. Admission limits are disabled on both apps to measure
+raw capacity.
+
+    python benchmarks/async_vs_sync.py --latency 0.2 --concurrency 50 200 1000
+    python benchmarks/async_vs_sync.py --offload-threads 32  # equal thread budget
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.cloud import language_v1, speech_v1p1beta1
+
+TRANSCRIPT = 'Your bank account is blocked, share the OTP'
+
+ENDPOINTS = {
+    # Native async Speech client path
+    'speech-to-text': '/api/speech-to-text',
+    # Native async Language client path
+    'detect-intent': '/api/detect-intent',
+    # Thread-offloaded Firestore path
+    'classify-call': '/api/classify-call',
+}
+
+# Seconds every fake backend call takes; set from --latency
+LATENCY = 0.2
+
+
+def _sentiment_response():
+    return SimpleNamespace(document_sentiment=SimpleNamespace(score=-0.6, magnitude=0.9))
+
+
+def _entities_response():
+    return SimpleNamespace(entities=[])
+
+
+def _recognize_response():
+    alternative = SimpleNamespace(transcript=TRANSCRIPT)
+    return SimpleNamespace(results=[SimpleNamespace(alternatives=[alternative], language_code='en-in')])
+
+
+class FakeLanguageClient:
+    def analyze_sentiment(self, request):
+        time.sleep(LATENCY)
+        return _sentiment_response()
+
+    def analyze_entities(self, request):
+        time.sleep(LATENCY)
+        return _entities_response()
+
+
+class FakeLanguageAsyncClient:
+    async def analyze_sentiment(self, request):
+        await asyncio.sleep(LATENCY)
+        return _sentiment_response()
+
+    async def analyze_entities(self, request):
+        await asyncio.sleep(LATENCY)
+        return _entities_response()
+
+
+class FakeSpeechClient:
+    def recognize(self, config, audio):
+        time.sleep(LATENCY)
+        return _recognize_response()
+
+
+class FakeSpeechAsyncClient:
+    async def recognize(self, config, audio):
+        await asyncio.sleep(LATENCY)
+        return _recognize_response()
+
+
+class FakeFirebaseService:
+    def save_call_analysis(self, result):
+        time.sleep(LATENCY)
+        return 'fake-id'
+
+
+def install_fake_clients():
+    # Patched before the apps are imported, so their services are built on the fakes
+    language_v1.LanguageServiceClient = FakeLanguageClient
+    language_v1.LanguageServiceAsyncClient = FakeLanguageAsyncClient
+    speech_v1p1beta1.SpeechClient = FakeSpeechClient
+    speech_v1p1beta1.SpeechAsyncClient = FakeSpeechAsyncClient
+
+
+def prepare_app(module):
+    module.speech_service = module.SpeechToTextService()
+    module.nlp_service = module.NLPService()
+    module.classification_service = module.CallClassificationService()
+    module.firebase_service = FakeFirebaseService()
+    module.admission.gates = {}
+    module.admission.async_gates = {}
+
+
+def request_kwargs(name, asynchronous):
+    if name == 'speech-to-text':
+        audio = (io.BytesIO(b'\x1aE\xdf\xa3 fake webm'), 'clip.webm')
+        if asynchronous:
+            from werkzeug.datastructures import FileStorage
+            return {'files': {'audio': FileStorage(audio[0], filename=audio[1])}}
+        return {'data': {'audio': audio}, 'content_type': 'multipart/form-data'}
+    if name == 'detect-intent':
+        return {'json': {'text': TRANSCRIPT, 'language': 'en-IN'}}
+    return {'json': {
+        'transcript': 'Your order is outside the gate',
+        'intent': {'intent': 'business', 'confidence': 80, 'keywords': ['order', 'gate']},
+        'deepfake': {'is_deepfake': False, 'confidence': 90}
+    }}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def run_sync(sync_app, name, concurrency, requests_per_client, sync_threads):
+    # test_client runs the view on the calling thread; the semaphore
+    # stands in for the worker's fixed request thread pool
+    server_threads = threading.BoundedSemaphore(sync_threads)
+    latencies = []
+    lock = threading.Lock()
+
+    def client_loop():
+        client = sync_app.test_client()
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            with server_threads:
+                response = client.post(ENDPOINTS[name], **request_kwargs(name, False))
+            assert response.status_code == 200, response.get_data(as_text=True)
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    clients = [threading.Thread(target=client_loop) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    return len(latencies) / (time.perf_counter() - start), latencies
+
+
+async def run_async(async_app, name, concurrency, requests_per_client):
+    client = async_app.test_client()
+    latencies = []
+
+    async def client_loop():
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            response = await client.post(ENDPOINTS[name], **request_kwargs(name, True))
+            assert response.status_code == 200, await response.get_data(as_text=True)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    return len(latencies) / (time.perf_counter() - start), latencies
+
+
+def main():
+    global LATENCY
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--latency', type=float, default=0.2, help='Injected backend latency (s)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[50, 200, 1000])
+    parser.add_argument('--requests-per-client', type=int, default=3)
+    parser.add_argument('--sync-threads', type=int, default=32, help='Request threads per sync worker')
+    parser.add_argument('--offload-threads', type=int, help='Async offload pool size, defaults to Config.ASYNC_OFFLOAD_THREADS')
+    parser.add_argument('--endpoint', choices=sorted(ENDPOINTS), nargs='+', default=sorted(ENDPOINTS))
+    args = parser.parse_args()
+
+    LATENCY = args.latency
+    install_fake_clients()
+
+    import app as sync_module
+    import asgi_app as async_module
+
+    prepare_app(sync_module)
+    prepare_app(async_module)
+    if args.offload_threads:
+        async_module.offload_executor = ThreadPoolExecutor(
+            max_workers=args.offload_threads, thread_name_prefix='phantomx-offload'
+        )
+    offload_threads = async_module.offload_executor._max_workers
+
+    print()
+    print(f"Injected latency {args.latency * 1000:.0f} ms, "
+          f"sync request threads {args.sync_threads}, async offload threads {offload_threads}")
+    print(f"{'endpoint':<16}{'clients':>8}{'sync rps':>11}{'async rps':>11}{'speedup':>9}"
+          f"{'sync p99 ms':>13}{'async p99 ms':>14}")
+    for name in args.endpoint:
+        for concurrency in args.concurrency:
+            sync_rps, sync_latencies = run_sync(
+                sync_module.app, name, concurrency, args.requests_per_client, args.sync_threads
+            )
+            async_rps, async_latencies = asyncio.run(
+                run_async(async_module.app, name, concurrency, args.requests_per_client)
+            )
+            print(f"{name:<16}{concurrency:>8}{sync_rps:>11.1f}{async_rps:>11.1f}"
+                  f"{async_rps / sync_rps:>8.1f}x"
+                  f"{percentile(sync_latencies, 99) * 1000:>13.0f}"
+                  f"{percentile(async_latencies, 99) * 1000:>14.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+Compare deepfake model runtimes: Keras vs exported NumPy weights
+
+Each runtime is loaded in a fresh subprocess so load time includes the
+framework import and memory is the process's own peak RSS. Export the
+weights first with `python -m models.export_model`.
+
+Inputs are real feature vectors (a saved .npy sample or a directory of
+clips): the 32 features span ~0.05 (ZCR) to ~5000 Hz (spectral centroid),
+and quantization error only shows at those scales. int8 is run both
+uncalibrated and calibrated on the even rows of the sample; drift and
+verdict flips are measured on the odd rows.
+
+    python benchmarks/deepfake_runtime.py --features samples/
+    python benchmarks/deepfake_runtime.py --features features.npy --skip-keras --batch-sizes 1 64
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+
+def peak_rss_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(runtime_name, path, quantization, calibrate, features_path, batch_sizes, iterations):
+    baseline_rss = peak_rss_mb()
+    start = time.perf_counter()
+
+    import numpy as np
+    from models.inference_runtime import KerasRuntime, NumpyRuntime
+
+    features = np.load(features_path)
+    calibration, evaluation = (features[::2], features[1::2]) if len(features) > 1 else (features, features)
+
+    if runtime_name == 'keras':
+        runtime = KerasRuntime(path)
+    else:
+        runtime = NumpyRuntime(path, quantization=quantization, calibration=calibration if calibrate else None)
+    total_load_ms = (time.perf_counter() - start) * 1000
+
+    latencies = {}
+    for batch_size in batch_sizes:
+        batch = np.resize(features, (batch_size, features.shape[1]))
+        samples = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            runtime.predict(batch)
+            samples.append((time.perf_counter() - start) * 1000)
+        samples.sort()
+        latencies[batch_size] = {
+            'p50': samples[len(samples) // 2],
+            'p99': samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        }
+
+    return {
+        'total_load_ms': total_load_ms,
+        'model_load_ms': runtime.load_time_ms,
+        'warmup_ms': runtime.warmup_ms,
+        'rss_mb': peak_rss_mb() - baseline_rss,
+        'latencies': latencies,
+        # Deepfake probability per evaluation row, as DeepfakeDetector reads it
+        'outputs': np.asarray(runtime.predict(evaluation))[:, -1].tolist()
+    }
+
+
+def run_child(runtime_name, path, quantization, calibrate, features_path, args):
+    command = [
+        sys.executable, os.path.abspath(__file__), '--child', runtime_name,
+        '--child-path', path, '--child-quantization', quantization,
+        '--child-features', features_path,
+        '--iterations', str(args.iterations), '--batch-sizes', *map(str, args.batch_sizes)
+    ]
+    if calibrate:
+        command.append('--child-calibrate')
+    output = subprocess.run(command, cwd=BACKEND_DIR, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--features', help='Feature sample (.npy) or directory of clips')
+    parser.add_argument('--keras-model', help='Defaults to Config.DEEPFAKE_MODEL_PATH')
+    parser.add_argument('--weights', help='Defaults to Config.DEEPFAKE_WEIGHTS_PATH')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 32])
+    parser.add_argument('--iterations', type=int, default=500)
+    parser.add_argument('--skip-keras', action='store_true')
+    parser.add_argument('--child', choices=['keras', 'numpy'], help=argparse.SUPPRESS)
+    parser.add_argument('--child-path', help=argparse.SUPPRESS)
+    parser.add_argument('--child-quantization', default='none', help=argparse.SUPPRESS)
+    parser.add_argument('--child-calibrate', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--child-features', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = child(
+            args.child, args.child_path, args.child_quantization, args.child_calibrate,
+            args.child_features, args.batch_sizes, args.iterations
+        )
+        print(json.dumps(result))
+        return
+
+    if not args.features:
+        parser.error('--features is required: benchmark on real feature vectors, not synthetic N(0, 1) input')
+
+    import numpy as np
+    from config import Config
+    from services.deepfake_service import load_feature_sample
+    keras_model = args.keras_model or Config.DEEPFAKE_MODEL_PATH
+    weights = args.weights or Config.DEEPFAKE_WEIGHTS_PATH
+
+    # Extracted once here; children only load the array
+    features_path = os.path.join(tempfile.mkdtemp(), 'features.npy')
+    np.save(features_path, load_feature_sample(args.features))
+
+    variants = [] if args.skip_keras else [('keras', keras_model, 'none', False)]
+    variants += [('numpy', weights, mode, False) for mode in ('none', 'float16', 'int8')]
+    variants.append(('numpy', weights, 'int8', True))
+
+    results = {}
+    for name, path, quantization, calibrate in variants:
+        label = name if name == 'keras' else f'numpy/{quantization}' + ('+cal' if calibrate else '')
+        results[label] = run_child(name, path, quantization, calibrate, features_path, args)
+
+    reference = results.get('keras', results['numpy/none'])['outputs']
+
+    header = f"{'runtime':<18}{'load ms':>10}{'warm-up ms':>12}{'RSS MB':>9}"
+    for batch_size in args.batch_sizes:
+        header += f"{f'b{batch_size} p50 ms':>13}{f'b{batch_size} p99 ms':>13}"
+    header += f"{'max |diff|':>12}{'flips':>8}"
+    print(header)
+
+    for label, result in results.items():
+        line = f"{label:<18}{result['total_load_ms']:>10.1f}{result['warmup_ms']:>12.2f}{result['rss_mb']:>9.1f}"
+        for batch_size in args.batch_sizes:
+            latency = result['latencies'][str(batch_size)]
+            line += f"{latency['p50']:>13.3f}{latency['p99']:>13.3f}"
+        diff = max(abs(a - b) for a, b in zip(result['outputs'], reference))
+        flips = sum((a > 0.5) != (b > 0.5) for a, b in zip(result['outputs'], reference))
+        line += f"{diff:>12.5f}{f'{flips}/{len(reference)}':>8}"
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Local load generator for the admission control layer
+
+Saturates /api/detect-deepfake with concurrent uploads while probing the
+lightweight endpoints, then compares their latency against an idle
+baseline. Run against a local API:
+
+    python app.py
+    python benchmarks/load_test.py --audio sample.webm
+
+Exits non-zero if the lightweight p99 grows more than --max-p99-ratio.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from collections import Counter
+
+LIGHT_ENDPOINTS = ['/', '/api/stats']
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def timed_get(url):
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url, timeout=30) as response:
+            response.read()
+    except urllib.error.HTTPError as e:
+        e.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def post_audio(url, filename, content):
+    """Upload an audio file as multipart/form-data"""
+    boundary = uuid.uuid4().hex
+    body = (
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="audio"; filename="{filename}"\r\n'
+        'Content-Type: application/octet-stream\r\n\r\n'
+    ).encode() + content + f'\r\n--{boundary}--\r\n'.encode()
+
+    req = urllib.request.Request(url, data=body, method='POST')
+    req.add_header('Content-Type', f'multipart/form-data; boundary={boundary}')
+    try:
+        with urllib.request.urlopen(req, timeout=120) as response:
+            return response.status, json.loads(response.read() or b'{}'), response.headers
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b'{}'), e.headers
+
+
+def probe_light(base_url, duration, interval):
+    """Hit the lightweight endpoints in a loop and collect latencies"""
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        for path in LIGHT_ENDPOINTS:
+            latencies.append(timed_get(base_url + path))
+        time.sleep(interval)
+    return latencies
+
+
+def saturate(base_url, filename, content, stop, results, lock):
+    url = base_url + '/api/detect-deepfake'
+    while not stop.is_set():
+        status, body, headers = post_audio(url, filename, content)
+        with lock:
+            results['status'][status] += 1
+            wait = body.get('timings', {}).get('queue_wait_ms')
+            if wait is not None:
+                results['queue_wait_ms'].append(wait)
+            if status in (429, 503) and not headers.get('Retry-After'):
+                results['missing_retry_after'] += 1
+        if status in (429, 503):
+            # Honour backpressure, but keep the pressure on
+            time.sleep(0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--audio', required=True, help='Audio file to upload to /api/detect-deepfake')
+    parser.add_argument('--clients', type=int, default=32, help='Concurrent deepfake uploaders')
+    parser.add_argument('--duration', type=float, default=20, help='Seconds per phase')
+    parser.add_argument('--interval', type=float, default=0.02, help='Delay between light probes')
+    parser.add_argument('--max-p99-ratio', type=float, default=2.0)
+    args = parser.parse_args()
+
+    base_url = args.url.rstrip('/')
+    with open(args.audio, 'rb') as f:
+        content = f.read()
+    filename = os.path.basename(args.audio)
+
+    print(f"Baseline: probing {', '.join(LIGHT_ENDPOINTS)} for {args.duration}s")
+    baseline = probe_light(base_url, args.duration, args.interval)
+
+    print(f"Saturating /api/detect-deepfake with {args.clients} clients")
+    stop = threading.Event()
+    lock = threading.Lock()
+    results = {'status': Counter(), 'queue_wait_ms': [], 'missing_retry_after': 0}
+    workers = [
+        threading.Thread(target=saturate, args=(base_url, filename, content, stop, results, lock), daemon=True)
+        for _ in range(args.clients)
+    ]
+    for worker in workers:
+        worker.start()
+    time.sleep(2)  # let the deepfake queue fill up
+    loaded = probe_light(base_url, args.duration, args.interval)
+    stop.set()
+    for worker in workers:
+        worker.join(timeout=120)
+
+    print()
+    print(f"{'phase':<12}{'requests':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, samples in (('baseline', baseline), ('saturated', loaded)):
+        print(f"{name:<12}{len(samples):>10}{percentile(samples, 50):>10.1f}{percentile(samples, 99):>10.1f}")
+
+    print()
+    print(f"Deepfake responses: {dict(results['status'])}")
+    if results['queue_wait_ms']:
+        print(f"Deepfake queue wait: p50 {percentile(results['queue_wait_ms'], 50):.1f} ms, "
+              f"p99 {percentile(results['queue_wait_ms'], 99):.1f} ms")
+
+    ratio = percentile(loaded, 99) / max(percentile(baseline, 99), 1e-6)
+    print(f"Lightweight p99 ratio (saturated / baseline): {ratio:.2f}")
+
+    failed = False
+    if ratio > args.max_p99_ratio:
+        print(f"❌ Lightweight p99 grew more than {args.max_p99_ratio}x under load")
+        failed = True
+    if results['missing_retry_after']:
+        print(f"❌ {results['missing_retry_after']} rejected responses without Retry-After")
+        failed = True
+    if not failed:
+        print("✅ Lightweight endpoints stayed flat while deepfake was saturated")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -21,7 +21,50 @@ class Config:
     
     # Model paths
     DEEPFAKE_MODEL_PATH = 'models/deepfake_detector.h5'
+    DEEPFAKE_WEIGHTS_PATH = 'models/deepfake_detector.npz'
+    # 'numpy' runs exported weights without TensorFlow; 'keras' loads the .h5
+    DEEPFAKE_RUNTIME = os.getenv('DEEPFAKE_RUNTIME', 'numpy')
+    # Applied when loading NumPy weights: 'none', 'float16' or 'int8'
+    DEEPFAKE_QUANTIZATION = os.getenv('DEEPFAKE_QUANTIZATION', 'none')
     TEMP_UPLOAD_FOLDER = '/tmp/phantomx_uploads'
     
+    # Admission control (per-endpoint concurrency limits and wait queues)
+    ENDPOINT_CONCURRENCY = {
+        'detect_deepfake': int(os.getenv('DEEPFAKE_CONCURRENCY', 2)),
+        'speech_to_text': int(os.getenv('SPEECH_CONCURRENCY', 16)),
+        'detect_intent': int(os.getenv('INTENT_CONCURRENCY', 16)),
+        'classify_call': int(os.getenv('CLASSIFY_CONCURRENCY', 16))
+    }
+    ADMISSION_QUEUE_SIZE = int(os.getenv('ADMISSION_QUEUE_SIZE', 8))
+    ADMISSION_QUEUE_TIMEOUT = float(os.getenv('ADMISSION_QUEUE_TIMEOUT', 10))
+    ADMISSION_RETRY_AFTER = int(os.getenv('ADMISSION_RETRY_AFTER', 5))
+    
+    # ASGI app: I/O-bound endpoints only wait on Google/Firestore, so one
+    # worker can hold far more of them in flight
+    ASYNC_ENDPOINT_CONCURRENCY = {
+        **ENDPOINT_CONCURRENCY,
+        'speech_to_text': int(os.getenv('ASYNC_IO_CONCURRENCY', 512)),
+        'detect_intent': int(os.getenv('ASYNC_IO_CONCURRENCY', 512)),
+        'classify_call': int(os.getenv('ASYNC_IO_CONCURRENCY', 512))
+    }
+    ASYNC_OFFLOAD_THREADS = int(os.getenv('ASYNC_OFFLOAD_THREADS', 256))
+    
+    # Process pool for CPU-bound audio feature extraction
+    FEATURE_EXTRACTION_WORKERS = int(os.getenv('FEATURE_EXTRACTION_WORKERS', max(1, (os.cpu_count() or 2) - 1)))
+    
+    # Fingerprints of confirmed scam clips, matched before full analysis
+    FINGERPRINT_INDEX_DIR = os.getenv('FINGERPRINT_INDEX_DIR', 'fingerprint_index')
+    FINGERPRINT_MAX_DISTANCE = int(os.getenv('FINGERPRINT_MAX_DISTANCE', 6))
+    # Seconds a clip's fingerprint waits for its classification to claim it
+    FINGERPRINT_PENDING_TTL = int(os.getenv('FINGERPRINT_PENDING_TTL', 3600))
+    
     # Supported languages
-    SUPPORTED_LANGUAGES = ['en-IN', 'hi-IN', 'ta-IN', 'te-IN', 'bn-IN', 'mr-IN']
\ No newline at end of file
+    SUPPORTED_LANGUAGES = ['en-IN', 'hi-IN', 'ta-IN', 'te-IN', 'bn-IN', 'mr-IN']
+    
+    # Keyword packs (one JSON file per language, reloaded when edited)
+    KEYWORD_PACK_DIR = os.getenv('KEYWORD_PACK_DIR', 'keyword_packs')
+    KEYWORD_PACK_RELOAD_INTERVAL = float(os.getenv('KEYWORD_PACK_RELOAD_INTERVAL', 5))
+    
+    # Languages sent to Google Natural Language for sentiment/entities;
+    # other languages are matched against keyword packs only
+    NLP_API_LANGUAGES = ['en', 'hi']
\ No newline at end of file
@@ -0,0 +1,52 @@
+import os
+import numpy as np
+from config import Config
+from models.inference_runtime import KerasRuntime, NumpyRuntime
+
+
+class DeepfakeDetector:
+    def __init__(self, runtime=None, quantization=None):
+        """
+        Load the deepfake classifier with the configured runtime
+
+        The NumPy runtime is preferred; if its weights have not been
+        exported yet, the Keras model is used instead. Without any model
+        on disk every clip scores a neutral 0.5.
+
+        Args:
+            runtime (str): 'numpy' or 'keras', defaults to Config.DEEPFAKE_RUNTIME
+            quantization (str): 'none', 'float16' or 'int8' for the NumPy runtime
+        """
+        runtime = runtime or Config.DEEPFAKE_RUNTIME
+        quantization = quantization or Config.DEEPFAKE_QUANTIZATION
+
+        if runtime == 'numpy' and os.path.exists(Config.DEEPFAKE_WEIGHTS_PATH):
+            self.runtime = NumpyRuntime(Config.DEEPFAKE_WEIGHTS_PATH, quantization=quantization)
+        elif os.path.exists(Config.DEEPFAKE_MODEL_PATH):
+            self.runtime = KerasRuntime(Config.DEEPFAKE_MODEL_PATH)
+        else:
+            self.runtime = None
+            print(f"⚠️ No deepfake model at {Config.DEEPFAKE_WEIGHTS_PATH} or "
+                  f"{Config.DEEPFAKE_MODEL_PATH}; predictions will be neutral")
+            return
+
+        info = self.runtime.describe()
+        print(f"✅ Deepfake model loaded ({info['runtime']}) in {info['load_time_ms']:.1f} ms, "
+              f"warm-up {info['warmup_ms']:.1f} ms")
+
+    def predict(self, features):
+        """
+        Probability that the voice is AI-generated
+
+        Args:
+            features (np.ndarray): Feature vector of shape (1, 32)
+
+        Returns:
+            float: Deepfake probability in [0, 1]
+        """
+        if self.runtime is None:
+            return 0.5
+
+        output = self.runtime.predict(features)
+        # Single sigmoid unit, or a two-class softmax with "fake" last
+        return float(np.ravel(output[0])[-1])
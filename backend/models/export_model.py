@@ -0,0 +1,39 @@
+"""
+Export the Keras deepfake detector to NumPy weights
+
+    python -m models.export_model
+    python -m models.export_model --quantization int8 --calibration samples/ --output models/deepfake_detector_int8.npz
+
+int8 exports should be calibrated on real feature vectors (a saved .npy
+sample or a directory of clips); without them, dense layers that see raw
+features stay float32.
+"""
+import argparse
+from config import Config
+from models.inference_runtime import QUANTIZATION_MODES, NumpyRuntime, export_keras_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--model', default=Config.DEEPFAKE_MODEL_PATH, help='Keras model to export')
+    parser.add_argument('--output', default=Config.DEEPFAKE_WEIGHTS_PATH, help='Destination .npz file')
+    parser.add_argument('--quantization', choices=QUANTIZATION_MODES, default='none')
+    parser.add_argument('--calibration', help='Feature sample (.npy) or directory of clips for int8 scales')
+    args = parser.parse_args()
+
+    calibration = None
+    if args.calibration:
+        from services.deepfake_service import load_feature_sample
+        calibration = load_feature_sample(args.calibration)
+        print(f"✅ Loaded {len(calibration)} calibration feature vectors")
+
+    ops = export_keras_model(args.model, args.output, quantization=args.quantization, calibration=calibration)
+    print(f"✅ Exported {len(ops)} ops from {args.model} to {args.output}")
+
+    # Loading also runs the warm-up batch, so a broken export fails here
+    runtime = NumpyRuntime(args.output)
+    print(f"✅ Verified export: {runtime.describe()}")
+
+
+if __name__ == '__main__':
+    main()
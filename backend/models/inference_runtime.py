@@ -0,0 +1,325 @@
+import json
+import time
+import numpy as np
+
+WEIGHTS_FORMAT_VERSION = 1
+
+QUANTIZATION_MODES = ('none', 'float16', 'int8')
+
+# Calibrated int8 ranges are widened so clips outside the sample don't clip
+CALIBRATION_HEADROOM = 1.5
+
+
+def _softmax(x):
+    exp = np.exp(x - x.max(axis=-1, keepdims=True))
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+_ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0),
+    'sigmoid': lambda x: 1 / (1 + np.exp(-x)),
+    'tanh': np.tanh,
+    'elu': lambda x: np.where(x > 0, x, np.expm1(x)),
+    'softmax': _softmax,
+}
+
+
+class InferenceRuntime:
+    """
+    Base class for deepfake model runtimes
+
+    Subclasses implement `_load` and `_run`; loading always ends with a
+    warm-up batch so the first real request does not pay for lazy
+    initialization.
+    """
+
+    name = 'base'
+
+    def __init__(self, path, warmup_batch=8):
+        self.path = path
+        self.load_time_ms = None
+        self.warmup_ms = None
+
+        start = time.perf_counter()
+        self._load()
+        self.load_time_ms = (time.perf_counter() - start) * 1000
+
+        self.warm_up(warmup_batch)
+
+    @property
+    def input_size(self):
+        raise NotImplementedError
+
+    def _load(self):
+        raise NotImplementedError
+
+    def _run(self, batch):
+        raise NotImplementedError
+
+    def predict(self, batch):
+        """
+        Run the model on a batch of feature vectors
+
+        Args:
+            batch (np.ndarray): Shape (n, input_size)
+
+        Returns:
+            np.ndarray: Model outputs, shape (n, outputs)
+        """
+        return self._run(np.asarray(batch, dtype=np.float32).reshape(-1, self.input_size))
+
+    def warm_up(self, batch_size=8):
+        start = time.perf_counter()
+        self.predict(np.zeros((batch_size, self.input_size), dtype=np.float32))
+        self.warmup_ms = (time.perf_counter() - start) * 1000
+
+    def describe(self):
+        return {
+            'runtime': self.name,
+            'path': self.path,
+            'load_time_ms': round(self.load_time_ms, 2),
+            'warmup_ms': round(self.warmup_ms, 2)
+        }
+
+
+class KerasRuntime(InferenceRuntime):
+    """Runs the original Keras model through TensorFlow"""
+
+    name = 'keras'
+
+    def _load(self):
+        # Imported lazily: TensorFlow alone costs seconds and hundreds of MB
+        import tensorflow as tf
+        self.model = tf.keras.models.load_model(self.path, compile=False)
+
+    @property
+    def input_size(self):
+        return int(self.model.input_shape[-1])
+
+    def _run(self, batch):
+        return np.asarray(self.model(batch, training=False))
+
+
+class NumpyRuntime(InferenceRuntime):
+    """
+    Runs exported weights with plain NumPy
+
+    Supports the layer types a small feed-forward detector uses (Dense,
+    Dropout, BatchNormalization, Normalization, Activation), exported by
+    `export_keras_model`.
+    """
+
+    name = 'numpy'
+
+    def __init__(self, path, quantization='none', calibration=None, warmup_batch=8):
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unknown quantization '{quantization}', expected one of {QUANTIZATION_MODES}")
+        self.quantization = quantization
+        self.calibration = calibration
+        super().__init__(path, warmup_batch=warmup_batch)
+
+    def _load(self):
+        with np.load(self.path, allow_pickle=False) as data:
+            spec = json.loads(str(data['spec']))
+            if spec['format_version'] != WEIGHTS_FORMAT_VERSION:
+                raise ValueError(f"Unsupported weights format {spec['format_version']}")
+            self.ops = []
+            for i, op in enumerate(spec['ops']):
+                for key in op.pop('arrays'):
+                    op[key] = data[f'op{i}_{key}']
+                self.ops.append(op)
+        self.ops = quantize_ops(self.ops, self.quantization, calibration=self.calibration)
+
+    @property
+    def input_size(self):
+        for op in self.ops:
+            if 'kernel' in op:
+                return op['kernel'].shape[0]
+            if 'scale' in op:
+                return op['scale'].shape[0]
+        raise ValueError("Model has no weighted layers")
+
+    def _run(self, batch):
+        x = batch
+        for op in self.ops:
+            x = _apply(x, op)
+        return x
+
+    def describe(self):
+        return {**super().describe(), 'quantization': self.quantization}
+
+
+def _dense(x, op):
+    kernel = op['kernel']
+    if kernel.dtype == np.int8:
+        if 'input_scale' in op:
+            # Static per-input-column offsets and scales, folded into the
+            # bias and kernel at quantization time
+            x_q = np.clip(np.round((x - op['input_offset']) / op['input_scale']), -127, 127).astype(np.int8)
+            acc = np.matmul(x_q, kernel, dtype=np.int32).astype(np.float32)
+            return acc * op['kernel_scale'] + op['bias']
+        # Dynamic per-row activation quantization, int32 accumulation
+        x_scale = np.abs(x).max(axis=1, keepdims=True) / 127
+        x_scale[x_scale == 0] = 1
+        x_q = np.round(x / x_scale).astype(np.int8)
+        acc = np.matmul(x_q, kernel, dtype=np.int32).astype(np.float32)
+        return acc * (x_scale * op['kernel_scale']) + op['bias']
+    if kernel.dtype == np.float16:
+        # NumPy has no float16 BLAS; upcasting the small kernel is cheaper
+        return x @ kernel.astype(np.float32) + op['bias']
+    return x @ kernel + op['bias']
+
+
+def _apply(x, op):
+    if op['type'] == 'affine':
+        x = x * op['scale'] + op['shift']
+    elif op['type'] == 'dense':
+        x = _dense(x, op)
+    return _ACTIVATIONS[op['activation']](x)
+
+
+def quantize_ops(ops, mode, calibration=None):
+    """
+    Quantize dense kernels of float32 ops
+
+    'float16' halves the weights; 'int8' stores symmetric per-output-channel
+    int8 kernels plus a float32 scale. Biases and affine layers stay float32.
+
+    int8 activations need comparable scales across a row. Hidden layers
+    get that from the layers before them and are quantized per row at run
+    time. A dense layer that sees raw features (no affine or dense op before
+    it) would round small features to zero next to large ones, so with a
+    `calibration` batch (realistic feature vectors) it gets static
+    per-input-column offsets and scales, folded into its bias and kernel;
+    without one it stays float32.
+    """
+    if mode == 'none':
+        return ops
+
+    x = None if calibration is None else np.asarray(calibration, dtype=np.float32)
+    normalized = False
+    quantized = []
+    for op in ops:
+        op = dict(op)
+        if op['type'] == 'dense' and op['kernel'].dtype == np.float32:
+            kernel = op['kernel']
+            if mode == 'float16':
+                op['kernel'] = kernel.astype(np.float16)
+            elif x is not None and not normalized:
+                input_offset = (x.max(axis=0) + x.min(axis=0)) / 2
+                input_scale = np.abs(x - input_offset).max(axis=0) * CALIBRATION_HEADROOM / 127
+                input_scale[input_scale == 0] = 1
+                folded = kernel * input_scale[:, None]
+                scale = np.abs(folded).max(axis=0, keepdims=True) / 127
+                scale[scale == 0] = 1
+                op['kernel'] = np.round(folded / scale).astype(np.int8)
+                op['kernel_scale'] = scale.astype(np.float32)
+                op['input_offset'] = input_offset.astype(np.float32)
+                op['input_scale'] = input_scale.astype(np.float32)
+                op['bias'] = (op['bias'] + input_offset @ kernel).astype(np.float32)
+            elif normalized:
+                # Inputs already share one scale; rows are quantized dynamically
+                scale = np.abs(kernel).max(axis=0, keepdims=True) / 127
+                scale[scale == 0] = 1
+                op['kernel'] = np.round(kernel / scale).astype(np.int8)
+                op['kernel_scale'] = scale.astype(np.float32)
+
+        if x is not None and not normalized:
+            # Raw features still flow into the next op
+            x = _apply(x, op)
+        normalized = normalized or op['type'] in ('affine', 'dense')
+        quantized.append(op)
+    return quantized
+
+
+def export_keras_model(keras_path, output_path, quantization='none', calibration=None):
+    """
+    Export a Keras feed-forward model to a NumPy weights file
+
+    Batch/feature normalization layers are folded into a single affine
+    op so the runtime only needs matmuls and element-wise functions.
+
+    Args:
+        keras_path (str): Path to the .h5/.keras model
+        output_path (str): Destination .npz file
+        quantization (str): One of QUANTIZATION_MODES
+        calibration (np.ndarray): Feature vectors for int8 activation scales
+
+    Returns:
+        list: Exported op descriptions
+    """
+    import tensorflow as tf
+    model = tf.keras.models.load_model(keras_path, compile=False)
+
+    ops = []
+    for layer in model.layers:
+        kind = type(layer).__name__
+        config = layer.get_config()
+
+        if kind in ('InputLayer', 'Dropout', 'Flatten', 'GaussianNoise'):
+            continue
+        elif kind == 'Dense':
+            weights = layer.get_weights()
+            kernel = weights[0]
+            bias = weights[1] if config['use_bias'] else np.zeros(kernel.shape[1])
+            ops.append({
+                'type': 'dense',
+                'activation': config['activation'],
+                'kernel': kernel.astype(np.float32),
+                'bias': bias.astype(np.float32)
+            })
+        elif kind == 'BatchNormalization':
+            gamma, beta, mean, variance = _batch_norm_weights(layer, config)
+            scale = gamma / np.sqrt(variance + config['epsilon'])
+            ops.append({
+                'type': 'affine',
+                'activation': 'linear',
+                'scale': scale.astype(np.float32),
+                'shift': (beta - mean * scale).astype(np.float32)
+            })
+        elif kind == 'Normalization':
+            mean = np.ravel(layer.mean.numpy())
+            std = np.sqrt(np.maximum(np.ravel(layer.variance.numpy()), 1e-7))
+            ops.append({
+                'type': 'affine',
+                'activation': 'linear',
+                'scale': (1 / std).astype(np.float32),
+                'shift': (-mean / std).astype(np.float32)
+            })
+        elif kind == 'Activation':
+            ops.append({'type': 'activation', 'activation': config['activation']})
+        else:
+            raise ValueError(f"Layer '{layer.name}' ({kind}) is not supported by the NumPy runtime")
+
+        if ops and ops[-1]['activation'] not in _ACTIVATIONS:
+            raise ValueError(f"Activation '{ops[-1]['activation']}' is not supported by the NumPy runtime")
+
+    ops = quantize_ops(ops, quantization, calibration=calibration)
+    save_ops(ops, output_path)
+    return ops
+
+
+def save_ops(ops, output_path):
+    arrays = {}
+    spec_ops = []
+    for i, op in enumerate(ops):
+        names = [key for key, value in op.items() if isinstance(value, np.ndarray)]
+        for key in names:
+            arrays[f'op{i}_{key}'] = op[key]
+        spec_ops.append({
+            **{key: value for key, value in op.items() if key not in names},
+            'arrays': names
+        })
+
+    spec = {'format_version': WEIGHTS_FORMAT_VERSION, 'ops': spec_ops}
+    np.savez(output_path, spec=np.array(json.dumps(spec)), **arrays)
+
+
+def _batch_norm_weights(layer, config):
+    weights = list(layer.get_weights())
+    size = weights[-1].shape[0]
+    gamma = weights.pop(0) if config['scale'] else np.ones(size)
+    beta = weights.pop(0) if config['center'] else np.zeros(size)
+    mean, variance = weights
+    return gamma, beta, mean, variance
@@ -0,0 +1,251 @@
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from functools import wraps
+from flask import g
+
+
+class ServiceOverloaded(Exception):
+    """Raised when a request is shed instead of being admitted"""
+
+    def __init__(self, endpoint, status_code, retry_after, reason):
+        super().__init__(reason)
+        self.endpoint = endpoint
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.reason = reason
+
+
+class EndpointGate:
+    def __init__(self, name, max_concurrent, max_queue):
+        """
+        Concurrency gate for a single endpoint
+
+        Args:
+            name (str): Endpoint name
+            max_concurrent (int): Requests allowed to run at the same time
+            max_queue (int): Requests allowed to wait for a free slot
+        """
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.active = 0
+        self.waiting = 0
+        self._cond = threading.Condition()
+
+    def enter(self, timeout):
+        """
+        Wait for a free slot
+
+        Returns:
+            float: Seconds spent waiting in the queue, or None if the
+            queue is already full
+
+        Raises:
+            TimeoutError: If no slot became free within `timeout`
+        """
+        start = time.perf_counter()
+        with self._cond:
+            if self.active < self.max_concurrent and self.waiting == 0:
+                self.active += 1
+                return 0.0
+
+            if self.waiting >= self.max_queue:
+                return None
+
+            self.waiting += 1
+            try:
+                admitted = self._cond.wait_for(
+                    lambda: self.active < self.max_concurrent,
+                    timeout=timeout
+                )
+                if not admitted:
+                    raise TimeoutError(f"No free slot for '{self.name}' after {timeout}s")
+                self.active += 1
+            finally:
+                self.waiting -= 1
+
+        return time.perf_counter() - start
+
+    def leave(self):
+        with self._cond:
+            self.active -= 1
+            self._cond.notify()
+
+    def snapshot(self):
+        with self._cond:
+            return {
+                'active': self.active,
+                'waiting': self.waiting,
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue
+            }
+
+
+class AsyncEndpointGate(EndpointGate):
+    def __init__(self, name, max_concurrent, max_queue):
+        """EndpointGate for a single asyncio event loop"""
+        super().__init__(name, max_concurrent, max_queue)
+        self._cond = asyncio.Condition()
+
+    async def enter(self, timeout):
+        start = time.perf_counter()
+        async with self._cond:
+            if self.active < self.max_concurrent and self.waiting == 0:
+                self.active += 1
+                return 0.0
+
+            if self.waiting >= self.max_queue:
+                return None
+
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(
+                    self._cond.wait_for(lambda: self.active < self.max_concurrent),
+                    timeout=timeout
+                )
+                self.active += 1
+            except asyncio.TimeoutError:
+                self._pass_on_notify()
+                raise TimeoutError(f"No free slot for '{self.name}' after {timeout}s")
+            except asyncio.CancelledError:
+                self._pass_on_notify()
+                raise
+            finally:
+                self.waiting -= 1
+
+        return time.perf_counter() - start
+
+    def _pass_on_notify(self):
+        # A notify that raced our timeout/cancellation would otherwise be
+        # lost, leaving a free slot while other waiters keep sleeping
+        if self.active < self.max_concurrent:
+            self._cond.notify()
+
+    async def leave(self):
+        async with self._cond:
+            self.active -= 1
+            self._cond.notify()
+
+    def snapshot(self):
+        return {
+            'active': self.active,
+            'waiting': self.waiting,
+            'max_concurrent': self.max_concurrent,
+            'max_queue': self.max_queue
+        }
+
+
+class AdmissionController:
+    def __init__(self, limits, max_queue=8, queue_timeout=10, retry_after=5):
+        """
+        Bounded admission control for expensive endpoints
+
+        Each endpoint gets its own concurrency limit and a small wait
+        queue. When the queue is full the request is rejected with 429,
+        and when a queued request cannot get a slot in time it is
+        rejected with 503. Endpoints without a limit are never gated.
+
+        Args:
+            limits (dict): Endpoint name -> max concurrent requests
+            max_queue (int): Requests allowed to wait per endpoint
+            queue_timeout (float): Seconds a request may wait for a slot
+            retry_after (int): Value of the Retry-After header on rejection
+        """
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.gates = {
+            name: EndpointGate(name, limit, max_queue)
+            for name, limit in limits.items()
+        }
+        self.async_gates = {
+            name: AsyncEndpointGate(name, limit, max_queue)
+            for name, limit in limits.items()
+        }
+        print("✅ Admission controller initialized")
+
+    @contextmanager
+    def admit(self, endpoint):
+        """
+        Hold a slot for `endpoint` for the duration of the block
+
+        Yields:
+            float: Queue wait time in milliseconds
+        """
+        gate = self.gates.get(endpoint)
+        if gate is None:
+            yield 0.0
+            return
+
+        try:
+            waited = gate.enter(self.queue_timeout)
+        except TimeoutError as e:
+            raise ServiceOverloaded(endpoint, 503, self.retry_after, str(e))
+
+        if waited is None:
+            raise ServiceOverloaded(
+                endpoint, 429, self.retry_after,
+                f"Too many pending requests for '{endpoint}'"
+            )
+
+        try:
+            yield round(waited * 1000, 2)
+        finally:
+            gate.leave()
+
+    def limit(self, endpoint):
+        """
+        Decorator for Flask views; stores the queue wait on `g.queue_wait_ms`
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                with self.admit(endpoint) as queue_wait_ms:
+                    g.queue_wait_ms = queue_wait_ms
+                    return view(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @asynccontextmanager
+    async def admit_async(self, endpoint):
+        """Async variant of admit for ASGI views"""
+        gate = self.async_gates.get(endpoint)
+        if gate is None:
+            yield 0.0
+            return
+
+        try:
+            waited = await gate.enter(self.queue_timeout)
+        except TimeoutError as e:
+            raise ServiceOverloaded(endpoint, 503, self.retry_after, str(e))
+
+        if waited is None:
+            raise ServiceOverloaded(
+                endpoint, 429, self.retry_after,
+                f"Too many pending requests for '{endpoint}'"
+            )
+
+        try:
+            yield round(waited * 1000, 2)
+        finally:
+            await gate.leave()
+
+    def limit_async(self, endpoint):
+        """
+        Decorator for Quart views; stores the queue wait on `g.queue_wait_ms`
+        """
+        from quart import g as quart_g
+
+        def decorator(view):
+            @wraps(view)
+            async def wrapper(*args, **kwargs):
+                async with self.admit_async(endpoint) as queue_wait_ms:
+                    quart_g.queue_wait_ms = queue_wait_ms
+                    return await view(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def get_status(self):
+        """Current occupancy of every gated endpoint"""
+        return {name: gate.snapshot() for name, gate in self.gates.items()}
@@ -27,14 +27,17 @@ class CallClassificationService:
             # Get deepfake analysis
             is_deepfake = deepfake.get('is_deepfake', False)
             deepfake_confidence = deepfake.get('confidence', 50)
+            known_scam = deepfake.get('known_scam')
             
             # Determine final call type
-            if call_intent == 'spam' or is_deepfake:
+            if call_intent == 'spam' or is_deepfake or known_scam:
                 call_type = 'spam'
                 risk_level = 'High Risk'
                 recommendation = 'Block and report this call immediately'
                 
-                if is_deepfake:
+                if known_scam:
+                    details = 'Recording matches a previously confirmed scam call.'
+                elif is_deepfake:
                     details = 'AI-generated voice detected. Likely voice cloning scam.'
                 else:
                     details = 'Spam keywords and suspicious patterns detected.'
@@ -90,6 +93,7 @@ class CallClassificationService:
                 'scores': {
                     'intent_confidence': intent_confidence,
                     'deepfake_confidence': deepfake_confidence,
+                    'deepfake_detected': bool(is_deepfake),
                     'spam_indicators': intent.get('spam_indicators', 0),
                     'business_indicators': intent.get('business_indicators', 0)
                 }
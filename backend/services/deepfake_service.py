@@ -1,14 +1,155 @@
 import librosa
+import multiprocessing
 import numpy as np
 import os
 import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from config import Config
 from models.deepfake_model import DeepfakeDetector
+from services.fingerprint_service import FingerprintIndex, compute_fingerprints
+
+
+# Worker-local index; each pool process maps the published generation itself
+_fingerprint_index = None
+
+
+def _worker_fingerprint_index(index_dir, max_distance):
+    global _fingerprint_index
+    if _fingerprint_index is None or _fingerprint_index.index_dir != index_dir:
+        _fingerprint_index = FingerprintIndex(index_dir, max_distance=max_distance)
+    return _fingerprint_index
+
+
+def _features_from_signal(y, sr):
+    """
+    Extract acoustic features for deepfake detection
+    
+    Features extracted:
+    - MFCC (Mel-frequency cepstral coefficients)
+    - Spectral features (centroid, rolloff, contrast)
+    - Pitch/fundamental frequency
+    - Zero crossing rate
+    """
+    # Extract MFCC features (13 coefficients)
+    mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
+    mfcc_mean = np.mean(mfcc, axis=1)
+    mfcc_std = np.std(mfcc, axis=1)
+    
+    # Spectral features
+    spectral_centroids = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
+    spectral_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)[0]
+    spectral_contrast = librosa.feature.spectral_contrast(y=y, sr=sr)
+    
+    # Zero crossing rate
+    zcr = librosa.feature.zero_crossing_rate(y)[0]
+    
+    # Pitch features
+    pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
+    
+    # Combine all features
+    features = np.concatenate([
+        mfcc_mean,
+        mfcc_std,
+        [np.mean(spectral_centroids)],
+        [np.std(spectral_centroids)],
+        [np.mean(spectral_rolloff)],
+        [np.mean(spectral_contrast)],
+        [np.mean(zcr)],
+        [np.std(zcr)]
+    ])
+    
+    return features.reshape(1, -1)
+
+
+def load_feature_sample(path):
+    """
+    Feature vectors at realistic scales, for int8 calibration and benchmarks
+    
+    Args:
+        path (str): Saved .npy sample of shape (n, 32), or a directory of
+            audio clips to extract one from
+        
+    Returns:
+        np.ndarray: Shape (n, 32)
+    """
+    if os.path.isfile(path):
+        return np.load(path).astype(np.float32).reshape(-1, 32)
+    
+    features = []
+    for name in sorted(os.listdir(path)):
+        y, sr = librosa.load(os.path.join(path, name), sr=16000, duration=30)
+        features.append(_features_from_signal(y, sr))
+    if not features:
+        raise ValueError(f"No audio clips in {path}")
+    return np.concatenate(features).astype(np.float32)
+
+
+def analyze_clip(audio_path, index_dir, max_distance):
+    """
+    Decode a clip once, then fingerprint it and extract features
+    
+    Runs in the feature extraction process pool, so it must stay a
+    module-level function that only takes picklable arguments. A failed
+    fingerprint or lookup only skips the cache; features are skipped when
+    the clip matches a confirmed scam.
+    
+    Returns:
+        dict: fingerprints, match, features (None on a match) and timings
+    """
+    timings = {}
+    
+    start = time.perf_counter()
+    try:
+        y, sr = librosa.load(audio_path, sr=16000, duration=30)
+    except Exception as e:
+        print(f"Feature extraction error: {e}")
+        return {'fingerprints': [], 'match': None, 'features': np.zeros((1, 32)), 'timings': timings}
+    timings['decode_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    
+    # Replays of confirmed scam clips get the cached verdict
+    fingerprints, match = [], None
+    try:
+        start = time.perf_counter()
+        fingerprints = compute_fingerprints(y, sr)
+        timings['fingerprint_ms'] = round((time.perf_counter() - start) * 1000, 2)
+        
+        if fingerprints:
+            start = time.perf_counter()
+            match = _worker_fingerprint_index(index_dir, max_distance).lookup(fingerprints[0])
+            timings['fingerprint_lookup_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    except Exception as e:
+        print(f"Fingerprint lookup error: {e}")
+    
+    if match:
+        return {'fingerprints': fingerprints, 'match': match, 'features': None, 'timings': timings}
+    
+    start = time.perf_counter()
+    try:
+        features = _features_from_signal(y, sr)
+    except Exception as e:
+        print(f"Feature extraction error: {e}")
+        features = np.zeros((1, 32))
+    timings['feature_extraction_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    
+    return {'fingerprints': fingerprints, 'match': match, 'features': features, 'timings': timings}
+
 
 class DeepfakeDetectionService:
     def __init__(self):
         """Initialize deepfake detection service"""
         try:
             self.model = DeepfakeDetector()
+            # Feature extraction is CPU-bound; keep it off the request threads
+            self._executor_lock = threading.Lock()
+            self.executor = self._create_executor()
+            self.fingerprints = FingerprintIndex(
+                Config.FINGERPRINT_INDEX_DIR,
+                max_distance=Config.FINGERPRINT_MAX_DISTANCE,
+                pending_ttl=Config.FINGERPRINT_PENDING_TTL
+            )
             print("✅ Deepfake detection service initialized")
         except Exception as e:
             print(f"❌ Deepfake service initialization failed: {e}")
@@ -31,11 +172,28 @@ class DeepfakeDetectionService:
                 temp_path = temp_file.name
             
             try:
-                # Extract features
-                features = self.extract_features(temp_path)
+                clip = self._run_in_pool(
+                    analyze_clip, temp_path,
+                    Config.FINGERPRINT_INDEX_DIR, Config.FINGERPRINT_MAX_DISTANCE
+                )
+                clip_id = self._stage_fingerprints(clip['fingerprints'])
+                match = clip['match']
+                timings = clip['timings']
+                
+                if match:
+                    return {
+                        'is_deepfake': match['is_deepfake'],
+                        'confidence': round(match['confidence'], 2),
+                        'risk_level': 'High',
+                        'known_scam': match,
+                        'clip_id': clip_id,
+                        'timings': timings
+                    }
                 
                 # Predict using ML model
-                prediction = self.model.predict(features)
+                start = time.perf_counter()
+                prediction = self.model.predict(clip['features'])
+                inference_ms = (time.perf_counter() - start) * 1000
                 
                 is_deepfake = prediction > 0.5
                 confidence = float(prediction if is_deepfake else 1 - prediction)
@@ -49,6 +207,11 @@ class DeepfakeDetectionService:
                         'spectral_features': True,
                         'pitch_analysis': True,
                         'zero_crossing_rate': True
+                    },
+                    'clip_id': clip_id,
+                    'timings': {
+                        **timings,
+                        'inference_ms': round(inference_ms, 2)
                     }
                 }
                 
@@ -69,51 +232,92 @@ class DeepfakeDetectionService:
                 'error': str(e)
             }
     
-    def extract_features(self, audio_path):
+    def _stage_fingerprints(self, fingerprints):
+        if not fingerprints:
+            return None
+        try:
+            return self.fingerprints.stage(fingerprints)
+        except Exception as e:
+            print(f"Error staging fingerprint: {e}")
+            return None
+    
+    def claim_fingerprints(self, clip_id):
         """
-        Extract acoustic features for deepfake detection
+        Fingerprints of the clip an analysis was given, for storing with it
         
-        Features extracted:
-        - MFCC (Mel-frequency cepstral coefficients)
-        - Spectral features (centroid, rolloff, contrast)
-        - Pitch/fundamental frequency
-        - Zero crossing rate
+        Args:
+            clip_id (str): Clip ID from the deepfake analysis response
+            
+        Returns:
+            list: Hex signatures, or None if the clip ID is not ours
         """
         try:
-            # Load audio file
-            y, sr = librosa.load(audio_path, sr=16000, duration=30)
-            
-            # Extract MFCC features (13 coefficients)
-            mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-            mfcc_mean = np.mean(mfcc, axis=1)
-            mfcc_std = np.std(mfcc, axis=1)
-            
-            # Spectral features
-            spectral_centroids = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-            spectral_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)[0]
-            spectral_contrast = librosa.feature.spectral_contrast(y=y, sr=sr)
-            
-            # Zero crossing rate
-            zcr = librosa.feature.zero_crossing_rate(y)[0]
-            
-            # Pitch features
-            pitches, magnitudes = librosa.piptrack(y=y, sr=sr)
+            signatures = self.fingerprints.claim(clip_id)
+        except Exception as e:
+            print(f"Error claiming fingerprint {clip_id}: {e}")
+            return None
+        if not signatures:
+            return None
+        return [f'{signature:016x}' for signature in signatures]
+    
+    def remember_confirmed_scam(self, result_id, analysis):
+        """
+        Index the clip behind a call analysis the user confirmed as spam
+        
+        Args:
+            result_id (str): Analysis document ID
+            analysis (dict): Stored classification result
             
-            # Combine all features
-            features = np.concatenate([
-                mfcc_mean,
-                mfcc_std,
-                [np.mean(spectral_centroids)],
-                [np.std(spectral_centroids)],
-                [np.mean(spectral_rolloff)],
-                [np.mean(spectral_contrast)],
-                [np.mean(zcr)],
-                [np.std(zcr)]
-            ])
+        Returns:
+            bool: Whether the clip was added to the fingerprint index
+        """
+        if not analysis or analysis.get('type') != 'spam' or not analysis.get('fingerprint'):
+            return False
+        
+        try:
+            # Only set by claim_fingerprints, never taken from the client
+            fingerprints = analysis['fingerprint']
             
-            return features.reshape(1, -1)
+            # Cache the deepfake verdict, not the overall call confidence
+            scores = analysis.get('scores', {})
+            self.fingerprints.add(
+                [int(fingerprint, 16) for fingerprint in fingerprints],
+                result_id,
+                is_deepfake=bool(scores.get('deepfake_detected', False)),
+                confidence=float(scores.get('deepfake_confidence', 50))
+            )
+            print(f"✅ Fingerprint indexed for confirmed scam {result_id}")
+            return True
             
         except Exception as e:
-            print(f"Feature extraction error: {e}")
-            # Return zero features if extraction fails
-            return np.zeros((1, 32))
\ No newline at end of file
+            print(f"Error indexing fingerprint for {result_id}: {e}")
+            return False
+    
+    def _create_executor(self):
+        # Workers come from a forkserver, never from forking this process:
+        # request threads and gRPC client threads are already running here
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(['services.deepfake_service'])
+        return ProcessPoolExecutor(
+            max_workers=Config.FEATURE_EXTRACTION_WORKERS,
+            mp_context=context
+        )
+    
+    def _run_in_pool(self, fn, *args):
+        """
+        Run `fn` in the process pool
+        
+        A worker that dies (e.g. OOM-killed) breaks the whole pool, so it is
+        replaced and the call retried once instead of failing every later
+        request.
+        """
+        executor = self.executor
+        try:
+            return executor.submit(fn, *args).result()
+        except BrokenProcessPool:
+            print("❌ Feature extraction pool broken, restarting workers")
+            with self._executor_lock:
+                if self.executor is executor:
+                    self.executor = self._create_executor()
+                    executor.shutdown(wait=False)
+            return self.executor.submit(fn, *args).result()
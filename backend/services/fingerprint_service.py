@@ -0,0 +1,332 @@
+import fcntl
+import os
+import re
+import shutil
+import time
+import uuid
+import librosa
+import numpy as np
+
+SIGNATURE_BITS = 64
+BAND_BITS = 8
+BANDS = SIGNATURE_BITS // BAND_BITS
+BUCKETS = 1 << BAND_BITS
+
+# 9 mel bands x 9 one-second segments -> 8 x 8 = 64 difference bits
+GRID = 9
+HOP_LENGTH = 160  # 10 ms at 16 kHz
+SEGMENT_FRAMES = 100
+TRIM_TOP_DB = 30
+
+# Start offsets (in frames) indexed for every confirmed clip, so a replay
+# that begins a little earlier or later than the original still matches
+SHIFTS = [shift for shift in range(-25, 51, 5) if shift != 0]
+
+_BIT_WEIGHTS = np.uint64(1) << np.arange(SIGNATURE_BITS, dtype=np.uint64)
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+_VERDICT_DTYPE = np.dtype([
+    ('result_id', 'S40'),
+    ('is_deepfake', '?'),
+    ('confidence', '<f4')
+])
+
+_ARRAYS = ('signatures', 'verdicts', 'band_order', 'band_offsets')
+
+_CLIP_ID = re.compile(r'^[0-9a-f]{32}$')
+
+
+def compute_fingerprints(y, sr):
+    """
+    64-bit acoustic signatures of the start of a clip
+
+    Leading silence is trimmed, then the telephone-band mel spectrogram
+    (the representation MFCCs are built from) is pooled into a grid of
+    fixed one-second segments. Each bit is the sign of the energy
+    difference between neighbouring bands, compared across neighbouring
+    segments, so gain, static equalization and codec coloring cancel out.
+
+    Args:
+        y (np.ndarray): Decoded audio
+        sr (int): Sample rate
+
+    Returns:
+        list: Signature at the trimmed start, followed by signatures at
+        each of SHIFTS; empty if less than GRID seconds of audio remain
+        after trimming
+    """
+    y, _ = librosa.effects.trim(y, top_db=TRIM_TOP_DB, frame_length=512, hop_length=HOP_LENGTH)
+    if not len(y):
+        return []
+
+    # Only the frames the latest shifted window can reach
+    y = y[:(GRID * SEGMENT_FRAMES + max(SHIFTS)) * HOP_LENGTH]
+    mel = librosa.feature.melspectrogram(
+        y=y, sr=sr, n_fft=512, hop_length=HOP_LENGTH, n_mels=GRID, fmin=300, fmax=3400
+    )
+    # Padded cells give the same bits for every clip, so short clips of
+    # unrelated speech would collide; they are not fingerprinted at all
+    if mel.shape[1] < GRID * SEGMENT_FRAMES or mel.sum() < 1e-6:
+        return []
+
+    return [_signature(mel, shift) for shift in [0] + SHIFTS]
+
+
+def _signature(mel, start):
+    width = GRID * SEGMENT_FRAMES
+    window = mel[:, max(start, 0):start + width]
+    # Shifted windows near either end of the clip are padded with silence
+    window = np.pad(window, ((0, 0), (max(-start, 0), 0)))
+    window = np.pad(window, ((0, 0), (0, width - window.shape[1])))
+
+    energy = np.log(window.reshape(GRID, GRID, SEGMENT_FRAMES).sum(axis=2) + 1e-10)
+    band_diff = energy[:-1] - energy[1:]
+    bits = (band_diff[:, 1:] - band_diff[:, :-1]) > 0
+    return int((bits.ravel().astype(np.uint64) * _BIT_WEIGHTS).sum())
+
+
+def _popcount(values):
+    return _POPCOUNT[values.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+class FingerprintIndex:
+    def __init__(self, index_dir, max_distance=6, pending_ttl=3600):
+        """
+        Locality-sensitive hash index of confirmed scam clips
+
+        Signatures are split into 8-bit bands; two clips become candidates
+        when any band matches exactly, and a candidate is a hit when its
+        Hamming distance is at most `max_distance`. With 8 bands any clip
+        within 7 bits shares at least one band, so no hit is missed.
+
+        Each version of the index is a `gen-<n>` directory of .npy files
+        (band entries pre-sorted by bucket) opened with mmap, so loading
+        reads and rebuilds nothing. The `CURRENT` file names the live
+        generation and is swapped atomically, so readers always see one
+        complete version.
+
+        Signatures of analyzed clips wait in `pending/` under a random clip
+        ID until their classification claims them, so clients only ever
+        see the ID and cannot submit signatures of their own.
+
+        Args:
+            index_dir (str): Directory holding the index generations
+            max_distance (int): Maximum Hamming distance for a match
+            pending_ttl (float): Seconds an unclaimed clip is kept
+        """
+        self.index_dir = index_dir
+        self.max_distance = max_distance
+        self.pending_ttl = pending_ttl
+        self._pending_pruned_at = 0
+        os.makedirs(self._pending_dir(), exist_ok=True)
+        self.generation = None
+        self._load_empty()
+        self.refresh()
+        print(f"✅ Fingerprint index loaded ({len(self.signatures)} signatures)")
+
+    def _pending_dir(self):
+        return os.path.join(self.index_dir, 'pending')
+
+    def _current_path(self):
+        return os.path.join(self.index_dir, 'CURRENT')
+
+    def _generation_dir(self, generation):
+        return os.path.join(self.index_dir, f'gen-{generation:08d}')
+
+    def _read_generation(self):
+        try:
+            with open(self._current_path()) as f:
+                return int(f.read().strip())
+        except FileNotFoundError:
+            return None
+
+    def _load_empty(self):
+        self.signatures = np.zeros(0, dtype=np.uint64)
+        self.verdicts = np.zeros(0, dtype=_VERDICT_DTYPE)
+        self.band_order = np.zeros((BANDS, 0), dtype=np.int64)
+        self.band_offsets = np.zeros((BANDS, BUCKETS + 1), dtype=np.int64)
+
+    def refresh(self):
+        """Switch to the latest published generation if it changed"""
+        for attempt in range(3):
+            generation = self._read_generation()
+            if generation is None or generation == self.generation:
+                return
+
+            directory = self._generation_dir(generation)
+            try:
+                arrays = {
+                    name: np.load(os.path.join(directory, f'{name}.npy'), mmap_mode='r')
+                    for name in _ARRAYS
+                }
+                break
+            except FileNotFoundError:
+                # Pruned by writers that published twice since we read CURRENT
+                if attempt == 2:
+                    raise
+
+        self.signatures = arrays['signatures']
+        self.verdicts = arrays['verdicts']
+        self.band_order = arrays['band_order']
+        self.band_offsets = arrays['band_offsets']
+        self.generation = generation
+
+    def lookup(self, signature):
+        """
+        Find the closest confirmed scam clip
+
+        Args:
+            signature (int): First signature from compute_fingerprints
+
+        Returns:
+            dict: Matched verdict with its Hamming distance, or None
+        """
+        self.refresh()
+        if signature is None or not len(self.signatures):
+            return None
+
+        bands = [(signature >> (band * BAND_BITS)) & (BUCKETS - 1) for band in range(BANDS)]
+        candidates = np.unique(np.concatenate([
+            self.band_order[band, self.band_offsets[band, key]:self.band_offsets[band, key + 1]]
+            for band, key in enumerate(bands)
+        ]))
+        if not len(candidates):
+            return None
+
+        distances = _popcount(self.signatures[candidates] ^ np.uint64(signature))
+        best = int(np.argmin(distances))
+        if distances[best] > self.max_distance:
+            return None
+
+        verdict = self.verdicts[candidates[best]]
+        return {
+            'result_id': verdict['result_id'].decode(),
+            'is_deepfake': bool(verdict['is_deepfake']),
+            'confidence': float(verdict['confidence']),
+            'distance': int(distances[best])
+        }
+
+    def stage(self, signatures):
+        """
+        Hold the signatures of an analyzed clip until it is classified
+
+        Args:
+            signatures (list): All signatures from compute_fingerprints
+
+        Returns:
+            str: Clip ID to hand to the client instead of the signatures
+        """
+        clip_id = uuid.uuid4().hex
+        path = os.path.join(self._pending_dir(), f'{clip_id}.npy')
+        with open(path + '.tmp', 'wb') as f:
+            np.save(f, np.array(signatures, dtype=np.uint64))
+        os.replace(path + '.tmp', path)
+
+        self._prune_pending()
+        return clip_id
+
+    def claim(self, clip_id):
+        """
+        Take the signatures staged under `clip_id`; each clip is claimed once
+
+        Args:
+            clip_id (str): ID returned by stage, as sent back by the client
+
+        Returns:
+            list: Signatures, or None for unknown, claimed or expired IDs
+        """
+        if not isinstance(clip_id, str) or not _CLIP_ID.match(clip_id):
+            return None
+
+        path = os.path.join(self._pending_dir(), f'{clip_id}.npy')
+        claimed_path = f'{path}.{uuid.uuid4().hex}.claimed'
+        try:
+            # Only one concurrent claim can win the rename
+            os.rename(path, claimed_path)
+        except FileNotFoundError:
+            return None
+
+        try:
+            if time.time() - os.stat(claimed_path).st_mtime > self.pending_ttl:
+                return None
+            return [int(signature) for signature in np.load(claimed_path)]
+        finally:
+            os.remove(claimed_path)
+
+    def _prune_pending(self):
+        now = time.time()
+        if now - self._pending_pruned_at < 60:
+            return
+        self._pending_pruned_at = now
+
+        for entry in os.scandir(self._pending_dir()):
+            try:
+                if now - entry.stat().st_mtime > self.pending_ttl:
+                    os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def add(self, signatures, result_id, is_deepfake=False, confidence=50.0):
+        """
+        Add a confirmed scam clip and publish a new index generation
+
+        Entries written by other workers are merged in under a file lock.
+
+        Args:
+            signatures (list): All signatures from compute_fingerprints
+            result_id (str): Analysis document ID
+            is_deepfake (bool): Deepfake verdict of the original analysis
+            confidence (float): Deepfake confidence of the original analysis
+        """
+        with open(os.path.join(self.index_dir, '.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self.refresh()
+
+            if result_id.encode() in np.asarray(self.verdicts['result_id']):
+                return
+
+            new_signatures = np.array(signatures, dtype=np.uint64)
+            new_verdicts = np.array(
+                [(result_id.encode(), is_deepfake, confidence)] * len(signatures),
+                dtype=_VERDICT_DTYPE
+            )
+            merged = np.concatenate([np.asarray(self.signatures), new_signatures])
+            band_order, band_offsets = self._build_bands(merged)
+            arrays = {
+                'signatures': merged,
+                'verdicts': np.concatenate([np.asarray(self.verdicts), new_verdicts]),
+                'band_order': band_order,
+                'band_offsets': band_offsets
+            }
+
+            generation = (self.generation or 0) + 1
+            directory = self._generation_dir(generation)
+            os.makedirs(directory, exist_ok=True)
+            for name, array in arrays.items():
+                np.save(os.path.join(directory, f'{name}.npy'), array)
+
+            temp_path = self._current_path() + '.tmp'
+            with open(temp_path, 'w') as f:
+                f.write(str(generation))
+            os.replace(temp_path, self._current_path())
+
+            self.refresh()
+            self._prune(keep_from=generation - 1)
+
+    def _prune(self, keep_from):
+        # Mapped files stay readable after unlink, and the previous
+        # generation is kept for readers that just read CURRENT
+        for name in os.listdir(self.index_dir):
+            if name.startswith('gen-') and int(name[len('gen-'):]) < keep_from:
+                shutil.rmtree(os.path.join(self.index_dir, name), ignore_errors=True)
+
+    def _build_bands(self, signatures):
+        """Per band: entry ids sorted by bucket, plus bucket start offsets"""
+        band_order = np.empty((BANDS, len(signatures)), dtype=np.int64)
+        band_offsets = np.empty((BANDS, BUCKETS + 1), dtype=np.int64)
+        for band in range(BANDS):
+            keys = (signatures >> np.uint64(band * BAND_BITS)) & np.uint64(BUCKETS - 1)
+            band_order[band] = np.argsort(keys, kind='stable')
+            band_offsets[band, 0] = 0
+            band_offsets[band, 1:] = np.cumsum(np.bincount(keys.astype(np.int64), minlength=BUCKETS))
+        return band_order, band_offsets
@@ -70,6 +70,24 @@ class FirebaseService:
             print(f"Error retrieving history: {e}")
             return []
     
+    def get_call_analysis(self, result_id):
+        """
+        Retrieve a single call analysis
+        
+        Args:
+            result_id (str): Analysis document ID
+            
+        Returns:
+            dict: Stored analysis, or None if missing
+        """
+        try:
+            doc = self.db.collection('call_analyses').document(result_id).get()
+            return doc.to_dict() if doc.exists else None
+            
+        except Exception as e:
+            print(f"Error retrieving analysis {result_id}: {e}")
+            return None
+    
     def save_feedback(self, result_id, is_correct):
         """
         Save user feedback for model improvement
@@ -0,0 +1,240 @@
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+
+# Zero-width joiners show up inconsistently in Indic transcripts
+_ZERO_WIDTH = dict.fromkeys(map(ord, '\u200b\u200c\u200d\ufeff'))
+
+# Unicode blocks used to guess the language of untagged text
+_SCRIPT_LANGUAGES = [
+    (0x0900, 0x097F, 'hi'),  # Devanagari (also Marathi)
+    (0x0980, 0x09FF, 'bn'),  # Bengali
+    (0x0B80, 0x0BFF, 'ta'),  # Tamil
+    (0x0C00, 0x0C7F, 'te'),  # Telugu
+]
+
+# Language codes double as pack file names, so nothing else may reach a path
+_LANGUAGE_CODE = re.compile(r'^[a-z]{2,3}$')
+
+_END = object()
+
+
+def normalize_text(text):
+    """NFKC-normalize, case-fold and strip zero-width characters"""
+    text = unicodedata.normalize('NFKC', text).casefold()
+    return text.translate(_ZERO_WIDTH)
+
+
+class KeywordIndex:
+    def __init__(self, terms):
+        """
+        Character trie over normalized keyword variants
+
+        Matching reports every variant that occurs anywhere in the text,
+        the same as a plain `keyword in text` scan, in a single pass.
+
+        Args:
+            terms (list): (variant, label) pairs
+        """
+        self.root = {}
+        for variant, label in terms:
+            node = self.root
+            for char in normalize_text(variant):
+                node = node.setdefault(char, {})
+            node.setdefault(_END, set()).add(label)
+
+    def find(self, normalized_text):
+        """Return the set of labels whose variants occur in the text"""
+        found = set()
+        root = self.root
+        length = len(normalized_text)
+        for start in range(length):
+            node = root.get(normalized_text[start])
+            position = start + 1
+            while node is not None:
+                labels = node.get(_END)
+                if labels:
+                    found.update(labels)
+                if position == length:
+                    break
+                node = node.get(normalized_text[position])
+                position += 1
+        return found
+
+
+class KeywordPack:
+    def __init__(self, language, version, spam, business, sources):
+        """
+        Compiled keyword pack for one language
+
+        Args:
+            language (str): ISO 639-1 code, e.g. 'hi'
+            version (str): Pack version from the JSON file
+            spam (dict): Label -> variants for spam indicators
+            business (dict): Label -> variants for business indicators
+            sources (dict): Pack file path -> mtime it was compiled from
+        """
+        self.language = language
+        self.version = version
+        self.spam_labels = list(spam)
+        self.business_labels = list(business)
+        self.sources = sources
+        self.index = KeywordIndex(
+            [(variant, ('spam', label)) for label, variants in spam.items() for variant in variants] +
+            [(variant, ('business', label)) for label, variants in business.items() for variant in variants]
+        )
+
+    def match(self, text):
+        """
+        Find spam and business keywords in `text`
+
+        Returns:
+            tuple: (spam labels, business labels), each in pack order
+        """
+        found = self.index.find(normalize_text(text))
+        spam = [label for label in self.spam_labels if ('spam', label) in found]
+        business = [label for label in self.business_labels if ('business', label) in found]
+        return spam, business
+
+
+class KeywordPackRegistry:
+    def __init__(self, pack_dir, reload_interval=5):
+        """
+        Lazily loaded, hot-reloadable keyword packs
+
+        Packs live in `<pack_dir>/<language>.json`:
+
+            {
+                "language": "hi",
+                "version": "1.0.0",
+                "extends": "en",
+                "spam_keywords": {"otp": ["ओटीपी", "otp batao"]},
+                "business_keywords": {"delivery": ["डिलीवरी"]}
+            }
+
+        Keyword lists may be plain lists (each keyword is its own label)
+        or label -> variants mappings, so native-script and transliterated
+        variants report the same label. A pack is compiled the first time
+        its language is requested and recompiled when any of its files
+        change on disk.
+
+        Args:
+            pack_dir (str): Directory containing the pack files
+            reload_interval (float): Minimum seconds between mtime checks
+        """
+        self.pack_dir = pack_dir
+        self.reload_interval = reload_interval
+        self.default_language = 'en'
+        self._packs = {}
+        self._checked_at = {}
+        self._lock = threading.Lock()
+
+    def resolve_language(self, text, hint=None):
+        """
+        Pick the pack language for `text`
+
+        Args:
+            text (str): Text to analyze
+            hint (str): Optional language code such as 'hi-IN'
+
+        Returns:
+            str: Language code of an existing pack
+        """
+        if hint:
+            language = hint.split('-')[0].lower()
+            if language in self.available_languages():
+                return language
+
+        counts = {}
+        for char in text:
+            code = ord(char)
+            for low, high, language in _SCRIPT_LANGUAGES:
+                if low <= code <= high:
+                    counts[language] = counts.get(language, 0) + 1
+                    break
+
+        if counts:
+            return max(counts, key=counts.get)
+        return self.default_language
+
+    def available_languages(self):
+        """Language codes that have a pack file"""
+        return {
+            name[:-len('.json')] for name in os.listdir(self.pack_dir)
+            if name.endswith('.json') and _LANGUAGE_CODE.match(name[:-len('.json')])
+        }
+
+    def get(self, language):
+        """Return the compiled pack for `language`, loading or reloading it if needed"""
+        now = time.monotonic()
+        pack = self._packs.get(language)
+        if pack is not None and now - self._checked_at.get(language, 0) < self.reload_interval:
+            return pack
+
+        with self._lock:
+            pack = self._packs.get(language)
+            if pack is None:
+                pack = self._compile(language)
+                print(f"✅ Keyword pack '{language}' v{pack.version} loaded")
+            elif self._is_stale(pack):
+                try:
+                    pack = self._compile(language)
+                    print(f"✅ Keyword pack '{language}' reloaded (v{pack.version})")
+                except Exception as e:
+                    # A broken edit must not take down a running worker
+                    print(f"❌ Keyword pack '{language}' reload failed, keeping v{pack.version}: {e}")
+            self._packs[language] = pack
+            self._checked_at[language] = now
+            return pack
+
+    def _path(self, language):
+        if not _LANGUAGE_CODE.match(language):
+            raise ValueError(f"Invalid keyword pack language '{language}'")
+        return os.path.join(self.pack_dir, f'{language}.json')
+
+    def _is_stale(self, pack):
+        try:
+            return any(
+                os.stat(path).st_mtime_ns != mtime
+                for path, mtime in pack.sources.items()
+            )
+        except OSError:
+            # Keep serving the last good pack if a file is mid-replace
+            return False
+
+    def _read(self, language, seen):
+        if language in seen:
+            raise ValueError(f"Circular keyword pack inheritance at '{language}'")
+        seen.append(language)
+
+        path = self._path(language)
+        mtime = os.stat(path).st_mtime_ns
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+
+        spam, business, sources = {}, {}, {}
+        if data.get('extends'):
+            _, spam, business, sources = self._read(data['extends'], seen)
+
+        for target, key in ((spam, 'spam_keywords'), (business, 'business_keywords')):
+            entries = data.get(key, [])
+            if isinstance(entries, list):
+                entries = {keyword: [keyword] for keyword in entries}
+            for label, variants in entries.items():
+                target[label] = list(dict.fromkeys(target.get(label, []) + variants))
+
+        sources[path] = mtime
+        return data, spam, business, sources
+
+    def _compile(self, language):
+        data, spam, business, sources = self._read(language, [])
+        return KeywordPack(
+            language=data.get('language', language),
+            version=str(data.get('version', '0')),
+            spam=spam,
+            business=business,
+            sources=sources
+        )
@@ -1,5 +1,7 @@
+import asyncio
 from google.cloud import language_v1
-import re
+from config import Config
+from services.keyword_pack_service import KeywordPackRegistry
 
 class NLPService:
     def __init__(self):
@@ -11,102 +13,156 @@ class NLPService:
             print(f"❌ NLP initialization failed: {e}")
             raise
         
-        # Spam/Scam indicators
-        self.spam_keywords = [
-            'otp', 'urgent', 'verify', 'bank account', 'blocked', 'suspend',
-            'immediately', 'prize', 'lottery', 'congratulations', 'winner',
-            'click here', 'limited time', 'act now', 'card details',
-            'password', 'pin', 'cvv', 'update kyc', 'account suspended',
-            'fraud', 'security alert', 'unauthorized', 'confirm identity',
-            'aadhaar', 'pan card', 'refund', 'cashback', 'offer expires'
-        ]
+        # Created on first async call so it binds to the serving event loop
+        self.async_client = None
         
-        # Delivery/Business call indicators
-        self.business_keywords = [
-            'delivery', 'order', 'package', 'courier', 'swiggy', 'zomato',
-            'address', 'location', 'reaching', 'arriving', 'outside', 'gate',
-            'apartment', 'pickup', 'drop', 'food', 'restaurant', 'amazon',
-            'flipkart', 'parcel', 'shipment', 'tracking', 'delivered'
-        ]
+        # Per-language spam/business keyword packs, compiled on first use
+        self.keyword_packs = KeywordPackRegistry(
+            Config.KEYWORD_PACK_DIR,
+            reload_interval=Config.KEYWORD_PACK_RELOAD_INTERVAL
+        )
     
-    def analyze_intent(self, text):
+    def analyze_intent(self, text, language=None):
         """
         Analyze text to detect intent, sentiment, and extract entities
         
         Args:
             text (str): Transcribed call text
+            language (str): Optional language code, e.g. 'hi-IN'; detected
+                from the script when omitted
             
         Returns:
             dict: Analysis results including intent, keywords, sentiment
         """
         try:
             if not text or len(text.strip()) < 3:
-                return {
-                    'intent': 'unknown',
-                    'keywords': [],
-                    'sentiment_score': 0,
-                    'confidence': 0
-                }
+                return self._empty_result()
             
-            # Create document
-            document = language_v1.Document(
-                content=text,
-                type_=language_v1.Document.Type.PLAIN_TEXT,
-                language="en"
-            )
+            pack = self._select_pack(text, language)
             
-            # Analyze sentiment
-            sentiment_response = self.client.analyze_sentiment(
-                request={'document': document}
-            )
-            sentiment = sentiment_response.document_sentiment
+            sentiment = None
+            entities = []
+            api_error = None
+            if pack.language in Config.NLP_API_LANGUAGES:
+                # Keyword matches stand on their own if the API call fails
+                try:
+                    document = self._build_document(text, pack.language)
+                    
+                    # Analyze sentiment
+                    sentiment_response = self.client.analyze_sentiment(
+                        request={'document': document}
+                    )
+                    sentiment = sentiment_response.document_sentiment
+                    
+                    # Analyze entities
+                    entities_response = self.client.analyze_entities(
+                        request={'document': document}
+                    )
+                    entities = entities_response.entities
+                except Exception as e:
+                    print(f"NLP API error: {e}")
+                    sentiment, entities, api_error = None, [], str(e)
             
-            # Analyze entities
-            entities_response = self.client.analyze_entities(
-                request={'document': document}
-            )
-            entities = entities_response.entities
+            return self._build_result(text, pack, sentiment, entities, api_error)
             
-            # Keyword-based classification
-            text_lower = text.lower()
-            
-            spam_matches = [kw for kw in self.spam_keywords if kw in text_lower]
-            business_matches = [kw for kw in self.business_keywords if kw in text_lower]
-            
-            spam_score = len(spam_matches)
-            business_score = len(business_matches)
+        except Exception as e:
+            print(f"NLP analysis error: {e}")
+            return self._empty_result(error=str(e))
+    
+    async def analyze_intent_async(self, text, language=None):
+        """
+        Async variant of analyze_intent using the async Language client
+        
+        Sentiment and entity requests are issued concurrently.
+        """
+        try:
+            if not text or len(text.strip()) < 3:
+                return self._empty_result()
             
-            # Determine intent
-            if spam_score > business_score and spam_score > 0:
-                intent = 'spam'
-                confidence = min(90, 60 + (spam_score * 10))
-            elif business_score > spam_score and business_score > 0:
-                intent = 'business'
-                confidence = min(90, 60 + (business_score * 10))
-            else:
-                intent = 'safe'
-                confidence = 50
+            pack = self._select_pack(text, language)
             
-            # Collect all detected keywords
-            detected_keywords = spam_matches + business_matches
+            sentiment = None
+            entities = []
+            api_error = None
+            if pack.language in Config.NLP_API_LANGUAGES:
+                # Keyword matches stand on their own if the API call fails
+                try:
+                    if self.async_client is None:
+                        self.async_client = language_v1.LanguageServiceAsyncClient()
+                    
+                    document = self._build_document(text, pack.language)
+                    sentiment_response, entities_response = await asyncio.gather(
+                        self.async_client.analyze_sentiment(request={'document': document}),
+                        self.async_client.analyze_entities(request={'document': document})
+                    )
+                    sentiment = sentiment_response.document_sentiment
+                    entities = entities_response.entities
+                except Exception as e:
+                    print(f"NLP API error: {e}")
+                    sentiment, entities, api_error = None, [], str(e)
             
-            return {
-                'intent': intent,
-                'confidence': confidence,
-                'keywords': detected_keywords[:10],  # Top 10 keywords
-                'sentiment_score': round(sentiment.score, 3),
-                'sentiment_magnitude': round(sentiment.magnitude, 3),
-                'spam_indicators': spam_score,
-                'business_indicators': business_score,
-                'entities': [entity.name for entity in entities[:5]]
-            }
+            return self._build_result(text, pack, sentiment, entities, api_error)
             
         except Exception as e:
             print(f"NLP analysis error: {e}")
-            return {
-                'intent': 'unknown',
-                'keywords': [],
-                'sentiment_score': 0,
-                'confidence': 0,
-                'error': str(e)
-            }
\ No newline at end of file
+            return self._empty_result(error=str(e))
+    
+    def _select_pack(self, text, language):
+        return self.keyword_packs.get(
+            self.keyword_packs.resolve_language(text, hint=language)
+        )
+    
+    def _build_document(self, text, language):
+        return language_v1.Document(
+            content=text,
+            type_=language_v1.Document.Type.PLAIN_TEXT,
+            language=language
+        )
+    
+    def _empty_result(self, error=None):
+        result = {
+            'intent': 'unknown',
+            'keywords': [],
+            'sentiment_score': 0,
+            'confidence': 0
+        }
+        if error:
+            result['error'] = error
+        return result
+    
+    def _build_result(self, text, pack, sentiment, entities, api_error=None):
+        """Keyword-based classification combined with the API analysis"""
+        spam_matches, business_matches = pack.match(text)
+        
+        spam_score = len(spam_matches)
+        business_score = len(business_matches)
+        
+        # Determine intent
+        if spam_score > business_score and spam_score > 0:
+            intent = 'spam'
+            confidence = min(90, 60 + (spam_score * 10))
+        elif business_score > spam_score and business_score > 0:
+            intent = 'business'
+            confidence = min(90, 60 + (business_score * 10))
+        else:
+            intent = 'safe'
+            confidence = 50
+        
+        # Collect all detected keywords
+        detected_keywords = spam_matches + business_matches
+        
+        result = {
+            'intent': intent,
+            'confidence': confidence,
+            'keywords': detected_keywords[:10],  # Top 10 keywords
+            'sentiment_score': round(sentiment.score, 3) if sentiment else 0,
+            'sentiment_magnitude': round(sentiment.magnitude, 3) if sentiment else 0,
+            'spam_indicators': spam_score,
+            'business_indicators': business_score,
+            'entities': [entity.name for entity in entities[:5]],
+            'language': pack.language,
+            'keyword_pack_version': pack.version
+        }
+        if api_error:
+            result['api_error'] = api_error
+        return result
\ No newline at end of file
@@ -1,12 +1,14 @@
 from google.cloud import speech_v1p1beta1 as speech
 import io
 import os
+from config import Config
 
 class SpeechToTextService:
     def __init__(self):
         """Initialize Google Cloud Speech-to-Text client"""
         try:
             self.client = speech.SpeechClient()
+            self.async_client = None
             print("✅ Speech-to-Text service initialized")
         except Exception as e:
             print(f"❌ Speech-to-Text initialization failed: {e}")
@@ -22,38 +24,79 @@ class SpeechToTextService:
         Returns:
             str: Transcribed text
         """
+        transcript, _ = self.transcribe_with_language(audio_file)
+        return transcript
+    
+    def transcribe_with_language(self, audio_file):
+        """
+        Convert audio to text and report the language Google recognized
+        
+        Args:
+            audio_file: Audio file object from request
+            
+        Returns:
+            tuple: (transcript, language code such as 'hi-IN')
+        """
         try:
             # Read audio content
             content = audio_file.read()
             
-            # Configure audio
-            audio = speech.RecognitionAudio(content=content)
-            
-            # Configure recognition
-            config = speech.RecognitionConfig(
-                encoding=speech.RecognitionConfig.AudioEncoding.WEBM_OPUS,
-                sample_rate_hertz=48000,
-                language_code="en-IN",  # Primary: Indian English
-                alternative_language_codes=["hi-IN", "ta-IN", "te-IN", "bn-IN", "mr-IN"],
-                enable_automatic_punctuation=True,
-                enable_word_time_offsets=False,
-                model="latest_long",  # Best for longer audio
-                use_enhanced=True  # Enhanced model for better accuracy
-            )
-            
             # Perform recognition
+            config, audio = self._build_request(content)
             response = self.client.recognize(config=config, audio=audio)
             
-            # Extract transcript
-            transcript = ""
-            for result in response.results:
-                transcript += result.alternatives[0].transcript + " "
+            return self._parse_response(response)
+            
+        except Exception as e:
+            print(f"Transcription error: {e}")
+            raise Exception(f"Failed to transcribe audio: {str(e)}")
+    
+    async def transcribe_with_language_async(self, audio_file):
+        """Async variant of transcribe_with_language using the async Speech client"""
+        try:
+            content = audio_file.read()
+            
+            # Created lazily so it binds to the serving event loop
+            if self.async_client is None:
+                self.async_client = speech.SpeechAsyncClient()
             
-            if not transcript.strip():
-                return "No speech detected in audio"
+            config, audio = self._build_request(content)
+            response = await self.async_client.recognize(config=config, audio=audio)
             
-            return transcript.strip()
+            return self._parse_response(response)
             
         except Exception as e:
             print(f"Transcription error: {e}")
-            raise Exception(f"Failed to transcribe audio: {str(e)}")
\ No newline at end of file
+            raise Exception(f"Failed to transcribe audio: {str(e)}")
+    
+    def _build_request(self, content):
+        # Configure audio
+        audio = speech.RecognitionAudio(content=content)
+        
+        # Configure recognition
+        config = speech.RecognitionConfig(
+            encoding=speech.RecognitionConfig.AudioEncoding.WEBM_OPUS,
+            sample_rate_hertz=48000,
+            language_code=Config.SUPPORTED_LANGUAGES[0],  # Primary: Indian English
+            alternative_language_codes=Config.SUPPORTED_LANGUAGES[1:],
+            enable_automatic_punctuation=True,
+            enable_word_time_offsets=False,
+            model="latest_long",  # Best for longer audio
+            use_enhanced=True  # Enhanced model for better accuracy
+        )
+        
+        return config, audio
+    
+    def _parse_response(self, response):
+        # Extract transcript
+        transcript = ""
+        language_code = Config.SUPPORTED_LANGUAGES[0]
+        for result in response.results:
+            transcript += result.alternatives[0].transcript + " "
+            if result.language_code:
+                language_code = result.language_code
+        
+        if not transcript.strip():
+            return "No speech detected in audio", language_code
+        
+        return transcript.strip(), language_code
\ No newline at end of file
@@ -0,0 +1,152 @@
+import asyncio
+import threading
+import time
+import pytest
+from services.admission_service import AdmissionController, AsyncEndpointGate, EndpointGate, ServiceOverloaded
+
+
+def wait_until(predicate, timeout=2):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.005)
+
+
+class Holder(threading.Thread):
+    """Holds a slot of `endpoint` until released"""
+
+    def __init__(self, controller, endpoint):
+        super().__init__(daemon=True)
+        self.controller = controller
+        self.endpoint = endpoint
+        self.release = threading.Event()
+        self.error = None
+
+    def run(self):
+        try:
+            with self.controller.admit(self.endpoint):
+                self.release.wait(5)
+        except ServiceOverloaded as e:
+            self.error = e
+
+
+def test_ungated_endpoint_is_always_admitted():
+    controller = AdmissionController({'detect': 1})
+    with controller.admit('history') as queue_wait_ms:
+        assert queue_wait_ms == 0.0
+
+
+def test_full_queue_is_rejected_with_429():
+    controller = AdmissionController({'detect': 1}, max_queue=1, queue_timeout=5, retry_after=7)
+    gate = controller.gates['detect']
+    holder = Holder(controller, 'detect')
+    holder.start()
+    wait_until(lambda: gate.active == 1)
+    queued = Holder(controller, 'detect')
+    queued.start()
+    wait_until(lambda: gate.waiting == 1)
+
+    with pytest.raises(ServiceOverloaded) as e:
+        with controller.admit('detect'):
+            pass
+    assert e.value.status_code == 429
+    assert e.value.retry_after == 7
+
+    holder.release.set()
+    queued.release.set()
+    holder.join()
+    queued.join()
+    assert queued.error is None
+    assert gate.snapshot()['active'] == 0
+
+
+def test_queue_timeout_is_rejected_with_503():
+    controller = AdmissionController({'detect': 1}, max_queue=1, queue_timeout=0.05)
+    holder = Holder(controller, 'detect')
+    holder.start()
+    wait_until(lambda: controller.gates['detect'].active == 1)
+
+    with pytest.raises(ServiceOverloaded) as e:
+        with controller.admit('detect'):
+            pass
+    assert e.value.status_code == 503
+    assert controller.gates['detect'].waiting == 0
+
+    holder.release.set()
+    holder.join()
+
+
+def test_waiter_is_woken_after_another_waiter_timed_out():
+    gate = EndpointGate('detect', max_concurrent=1, max_queue=2)
+    assert gate.enter(1) == 0.0
+
+    admitted = []
+    waiter = threading.Thread(target=lambda: admitted.append(gate.enter(5)), daemon=True)
+    waiter.start()
+    wait_until(lambda: gate.waiting == 1)
+
+    with pytest.raises(TimeoutError):
+        gate.enter(0.05)
+
+    gate.leave()
+    waiter.join(2)
+    assert admitted and admitted[0] is not None
+    assert gate.active == 1
+
+
+def test_async_full_queue_and_timeout():
+    async def scenario():
+        controller = AdmissionController({'detect': 1}, max_queue=1, queue_timeout=0.05)
+        async with controller.admit_async('detect'):
+            queued = asyncio.create_task(controller.admit_async('detect').__aenter__())
+            await asyncio.sleep(0)
+
+            with pytest.raises(ServiceOverloaded) as full:
+                async with controller.admit_async('detect'):
+                    pass
+
+            with pytest.raises(ServiceOverloaded) as timed_out:
+                await queued
+
+        return full.value.status_code, timed_out.value.status_code
+
+    assert asyncio.run(scenario()) == (429, 503)
+
+
+def test_async_waiter_is_woken_after_another_waiter_timed_out():
+    async def scenario():
+        gate = AsyncEndpointGate('detect', max_concurrent=1, max_queue=2)
+        await gate.enter(1)
+        waiter = asyncio.create_task(gate.enter(5))
+        while not gate._cond._waiters:
+            await asyncio.sleep(0)
+
+        with pytest.raises(TimeoutError):
+            await gate.enter(0.05)
+
+        await gate.leave()
+        return await asyncio.wait_for(waiter, 1)
+
+    assert asyncio.run(scenario()) is not None
+
+
+def test_async_notify_is_passed_on_when_woken_waiter_is_cancelled():
+    async def scenario():
+        gate = AsyncEndpointGate('detect', max_concurrent=1, max_queue=2)
+        await gate.enter(1)
+        first = asyncio.create_task(gate.enter(5))
+        second = asyncio.create_task(gate.enter(5))
+        while len(gate._cond._waiters) < 2:
+            await asyncio.sleep(0)
+
+        # `first` is cancelled and then handed the slot before either runs
+        first.cancel()
+        await gate.leave()
+
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        await asyncio.wait_for(second, 1)
+        return gate.snapshot()
+
+    assert asyncio.run(scenario())['active'] == 1
@@ -0,0 +1,145 @@
+import os
+import numpy as np
+import pytest
+from services.fingerprint_service import FingerprintIndex, compute_fingerprints, SHIFTS
+
+SR = 16000
+
+
+def speech(seed, seconds=10):
+    """Voiced syllables with random pitch and formants, separated by pauses"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(SR * seconds) / SR
+    y = np.zeros_like(t)
+    pos = 0.0
+    while pos < seconds:
+        duration = rng.uniform(0.08, 0.35)
+        f0 = rng.uniform(90, 220)
+        formants = rng.uniform(300, 3000, 3)
+        mask = (t >= pos) & (t < pos + duration)
+        tt = t[mask] - pos
+        voice = sum(
+            np.sin(2 * np.pi * k * f0 * tt) * np.exp(-min(abs(k * f0 - f) for f in formants) / 300)
+            for k in range(1, 25)
+        )
+        y[mask] += np.sin(np.pi * tt / duration) * voice * rng.uniform(0.3, 1)
+        pos += duration + rng.uniform(0, 0.15)
+    return (y / np.abs(y).max() * 0.5).astype(np.float32)
+
+
+def replay(y, seed=0):
+    """Same clip starting 200 ms later, quieter and with background noise"""
+    rng = np.random.default_rng(seed)
+    y = np.concatenate([np.zeros(SR // 5, dtype=np.float32), y * 0.4])
+    return y + rng.normal(0, 0.004, len(y)).astype(np.float32)
+
+
+@pytest.fixture
+def index_dir(tmp_path):
+    return str(tmp_path / 'index')
+
+
+def test_fingerprints_include_every_shift():
+    fingerprints = compute_fingerprints(speech(1), SR)
+    assert len(fingerprints) == len(SHIFTS) + 1
+    assert all(0 <= signature < 2 ** 64 for signature in fingerprints)
+
+
+def test_silent_clip_has_no_fingerprint():
+    assert compute_fingerprints(np.zeros(SR * 10, dtype=np.float32), SR) == []
+
+
+def test_clip_shorter_than_the_grid_has_no_fingerprint():
+    # 9.5 s long, but only 8.5 s of it is left once leading silence is trimmed
+    y = np.concatenate([np.zeros(SR, dtype=np.float32), speech(1, seconds=10)[:SR * 17 // 2]])
+    assert compute_fingerprints(y, SR) == []
+
+
+def test_unrelated_short_clips_do_not_match(index_dir):
+    index = FingerprintIndex(index_dir)
+    for seed in range(1, 4):
+        index.add(compute_fingerprints(speech(seed), SR), f'call-{seed}')
+
+    # Short clips are never fingerprinted, so they can't hit the index
+    for seconds in (1, 3, 8):
+        for seed in range(100, 110):
+            assert compute_fingerprints(speech(seed, seconds=seconds), SR) == []
+
+    for seed in range(100, 110):
+        assert index.lookup(compute_fingerprints(speech(seed), SR)[0]) is None
+
+
+def test_add_persist_reload_lookup(index_dir):
+    index = FingerprintIndex(index_dir)
+    assert index.lookup(compute_fingerprints(speech(1), SR)[0]) is None
+
+    fingerprints = compute_fingerprints(speech(1), SR)
+    index.add(fingerprints, 'call-1', is_deepfake=True, confidence=87.5)
+    assert index.generation == 1
+
+    reloaded = FingerprintIndex(index_dir)
+    assert reloaded.generation == 1
+    assert len(reloaded.signatures) == len(fingerprints)
+
+    match = reloaded.lookup(fingerprints[0])
+    assert match == {'result_id': 'call-1', 'is_deepfake': True, 'confidence': 87.5, 'distance': 0}
+
+
+def test_readers_pick_up_new_generations(index_dir):
+    reader = FingerprintIndex(index_dir)
+    writer = FingerprintIndex(index_dir)
+
+    writer.add(compute_fingerprints(speech(1), SR), 'call-1')
+    writer.add(compute_fingerprints(speech(2), SR), 'call-2')
+    writer.add(compute_fingerprints(speech(3), SR), 'call-3')
+    assert writer.generation == 3
+
+    match = reader.lookup(compute_fingerprints(speech(2), SR)[0])
+    assert reader.generation == 3
+    assert match['result_id'] == 'call-2'
+
+    # Only the live generation and the one before it are kept
+    generations = sorted(name for name in os.listdir(index_dir) if name.startswith('gen-'))
+    assert generations == ['gen-00000002', 'gen-00000003']
+
+
+def test_adding_the_same_result_twice_is_a_no_op(index_dir):
+    index = FingerprintIndex(index_dir)
+    fingerprints = compute_fingerprints(speech(1), SR)
+    index.add(fingerprints, 'call-1')
+    index.add(fingerprints, 'call-1')
+    assert index.generation == 1
+
+
+def test_shifted_noisy_replay_matches_only_its_original(index_dir):
+    index = FingerprintIndex(index_dir, max_distance=6)
+    for seed in range(1, 6):
+        index.add(compute_fingerprints(speech(seed), SR), f'call-{seed}')
+
+    match = index.lookup(compute_fingerprints(replay(speech(3)), SR)[0])
+    assert match is not None
+    assert match['result_id'] == 'call-3'
+
+    assert index.lookup(compute_fingerprints(replay(speech(42)), SR)[0]) is None
+
+
+def test_staged_fingerprints_are_claimed_once(index_dir):
+    index = FingerprintIndex(index_dir)
+    fingerprints = compute_fingerprints(speech(1), SR)
+
+    clip_id = index.stage(fingerprints)
+    assert FingerprintIndex(index_dir).claim(clip_id) == fingerprints
+    assert index.claim(clip_id) is None
+
+
+def test_claim_rejects_unknown_and_expired_clip_ids(index_dir):
+    index = FingerprintIndex(index_dir, pending_ttl=60)
+    clip_id = index.stage(compute_fingerprints(speech(1), SR))
+
+    for bad_id in (None, 42, 'f' * 32, '../CURRENT', clip_id.upper()):
+        assert index.claim(bad_id) is None
+
+    path = os.path.join(index_dir, 'pending', f'{clip_id}.npy')
+    os.utime(path, (0, 0))
+    assert index.claim(clip_id) is None
+    assert not os.path.exists(path)
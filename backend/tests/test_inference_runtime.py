@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from models.inference_runtime import NumpyRuntime, save_ops
+
+
+def raw_features(rng, n):
+    """Unnormalized feature vectors at the scales the deepfake service extracts"""
+    return np.concatenate([
+        rng.normal(0, 20, (n, 13)),         # MFCC means
+        rng.uniform(5, 15, (n, 13)),        # MFCC stds
+        rng.uniform(2000, 5000, (n, 2)),    # spectral centroid mean/std
+        rng.uniform(3000, 6000, (n, 1)),    # spectral rolloff
+        rng.uniform(15, 25, (n, 1)),        # spectral contrast
+        rng.uniform(0.02, 0.1, (n, 2)),     # zero crossing rate mean/std
+    ], axis=1).astype(np.float32)
+
+
+@pytest.fixture
+def raw_feature_model(tmp_path):
+    """Dense network trained on raw features: no normalization layer first"""
+    rng = np.random.default_rng(0)
+    sample = raw_features(rng, 2000)
+    mean, std = sample.mean(axis=0), sample.std(axis=0)
+    kernel = (rng.normal(0, 1, (32, 64)) / std[:, None] / 6).astype(np.float32)
+    ops = [
+        {'type': 'dense', 'activation': 'relu', 'kernel': kernel, 'bias': (-(mean @ kernel)).astype(np.float32)},
+        {'type': 'dense', 'activation': 'sigmoid', 'kernel': rng.normal(0, 0.3, (64, 1)).astype(np.float32),
+         'bias': np.zeros(1, dtype=np.float32)},
+    ]
+    path = str(tmp_path / 'weights.npz')
+    save_ops(ops, path)
+    return path, sample[:500], sample[500:700]
+
+
+def verdict_flips(reference, output):
+    return int(((reference[:, -1] > 0.5) != (output[:, -1] > 0.5)).sum())
+
+
+def test_uncalibrated_int8_keeps_raw_feature_layer_in_float(raw_feature_model):
+    path, _, evaluation = raw_feature_model
+    reference = NumpyRuntime(path).predict(evaluation)
+    runtime = NumpyRuntime(path, quantization='int8')
+
+    assert [op['kernel'].dtype for op in runtime.ops] == [np.float32, np.int8]
+    assert verdict_flips(reference, runtime.predict(evaluation)) <= 1
+
+
+def test_calibrated_int8_quantizes_raw_features_per_column(raw_feature_model):
+    path, calibration, evaluation = raw_feature_model
+    reference = NumpyRuntime(path).predict(evaluation)
+    runtime = NumpyRuntime(path, quantization='int8', calibration=calibration)
+
+    assert [op['kernel'].dtype for op in runtime.ops] == [np.int8, np.int8]
+    output = runtime.predict(evaluation)
+    assert verdict_flips(reference, output) == 0
+    assert np.abs(output - reference).max() < 0.05
+
+
+def test_calibrated_int8_survives_export_round_trip(raw_feature_model, tmp_path):
+    path, calibration, evaluation = raw_feature_model
+    runtime = NumpyRuntime(path, quantization='int8', calibration=calibration)
+
+    exported = str(tmp_path / 'int8.npz')
+    save_ops(runtime.ops, exported)
+    np.testing.assert_allclose(NumpyRuntime(exported).predict(evaluation), runtime.predict(evaluation))
+
@@ -0,0 +1,98 @@
+import json
+import os
+import pytest
+from services.keyword_pack_service import KeywordPackRegistry, normalize_text
+
+PACK_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'keyword_packs')
+
+
+def write_pack(pack_dir, language, mtime=None, **data):
+    path = pack_dir / f'{language}.json'
+    path.write_text(json.dumps({'language': language, **data}, ensure_ascii=False), encoding='utf-8')
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+    return path
+
+
+@pytest.fixture
+def pack_dir(tmp_path):
+    write_pack(
+        tmp_path, 'en', version='1.0.0',
+        spam_keywords=['otp', 'bank account'],
+        business_keywords=['delivery']
+    )
+    write_pack(
+        tmp_path, 'hi', version='1.0.0', extends='en',
+        spam_keywords={'otp': ['ओटीपी', 'otp batao'], 'lottery': ['लॉटरी']},
+        business_keywords={'delivery': ['डिलीवरी']}
+    )
+    return tmp_path
+
+
+def test_normalize_text_folds_width_case_and_zero_width():
+    assert normalize_text('ＯＴＰ Bank') == 'otp bank'
+    assert normalize_text('ओटी‍पी') == 'ओटीपी'
+
+
+def test_extends_merges_variants_under_the_same_label(pack_dir):
+    pack = KeywordPackRegistry(str(pack_dir)).get('hi')
+    assert pack.spam_labels == ['otp', 'bank account', 'lottery']
+
+    spam, business = pack.match('आपका ओटीपी बताइए, डिलीवरी रुकी है')
+    assert spam == ['otp']
+    assert business == ['delivery']
+
+    # Parent variants still match in the child pack
+    assert pack.match('share your OTP and bank account')[0] == ['otp', 'bank account']
+
+
+def test_circular_extends_is_rejected(tmp_path):
+    write_pack(tmp_path, 'aa', extends='bb')
+    write_pack(tmp_path, 'bb', extends='aa')
+    with pytest.raises(ValueError):
+        KeywordPackRegistry(str(tmp_path)).get('aa')
+
+
+def test_changed_pack_is_reloaded(pack_dir):
+    registry = KeywordPackRegistry(str(pack_dir), reload_interval=0)
+    assert registry.get('hi').match('लॉटरी जीती')[0] == ['lottery']
+
+    # Changing the parent reloads every pack that extends it
+    write_pack(pack_dir, 'en', mtime=1, version='1.1.0', spam_keywords=['otp', 'prize'])
+    pack = registry.get('hi')
+    assert 'prize' in pack.spam_labels
+    assert pack.match('you won a prize')[0] == ['prize']
+
+
+def test_broken_edit_keeps_the_last_good_pack(pack_dir):
+    registry = KeywordPackRegistry(str(pack_dir), reload_interval=0)
+    pack = registry.get('hi')
+
+    path = pack_dir / 'hi.json'
+    path.write_text('{"language": "hi", ', encoding='utf-8')
+    os.utime(path, ns=(1, 1))
+    assert registry.get('hi') is pack
+
+
+def test_resolve_language_uses_hint_or_script(pack_dir):
+    registry = KeywordPackRegistry(str(pack_dir))
+    assert registry.resolve_language('hello', hint='hi-IN') == 'hi'
+    assert registry.resolve_language('नमस्ते') == 'hi'
+    assert registry.resolve_language('hello', hint='fr-FR') == 'en'
+
+
+def test_resolve_language_ignores_path_hints(pack_dir):
+    (pack_dir / 'secrets').mkdir()
+    write_pack(pack_dir / 'secrets', 'config', spam_keywords=['leaked'])
+    registry = KeywordPackRegistry(str(pack_dir))
+
+    for hint in ('secrets/config', '../hi', '/etc/passwd', 'EN/../hi'):
+        assert registry.resolve_language('hello', hint=hint) == 'en'
+    with pytest.raises(ValueError):
+        registry.get('secrets/config')
+
+
+def test_hindi_address_needs_more_than_pata():
+    pack = KeywordPackRegistry(PACK_DIR).get('hi')
+    assert 'address' not in pack.match('मुझे पता नहीं')[1]
+    assert 'address' in pack.match('अपना पता बताइए')[1]